@@ -1,19 +1,53 @@
 """Camera management for drone and laptop video sources."""
 
 import cv2
+import json
 import numpy as np
 import time
 import logging
-import platform
-from typing import Optional, Tuple, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple, List
 from .models import CameraConfig
 
 # Import Windows compatibility utilities
 try:
-    from .windows_compat import windows_compat
+    from .windows_compat import IS_WINDOWS, get_windows_compat
+    windows_compat = get_windows_compat() if IS_WINDOWS else None
 except ImportError:
+    IS_WINDOWS = False
     windows_compat = None
 
+_FOURCC_MJPG = cv2.VideoWriter_fourcc(*'MJPG')
+
+# is_connected() reports a camera without a frame for this long (5 s) as disconnected
+_STALE_FRAME_NS = 5_000_000_000
+
+# Fallback probing skips an index that failed to open for this long (30 s), so a busy or
+# not yet attached device is retried later
+_DEAD_CAMERA_TTL_NS = 30_000_000_000
+
+# Last laptop camera that opened successfully, reused by the next start within an hour
+_CAMERA_CACHE_PATH = Path.home() / '.drone-fpv' / 'last_camera.json'
+_CAMERA_CACHE_MAX_AGE = 3600
+
+
+class _Reader:
+    """A background reader thread with its own stop event.
+
+    exited and owns_capture are guarded by CameraManager._frame_lock. A reader that
+    is still inside read() when stopping times out is given ownership of its capture
+    and releases it itself once read() returns.
+    """
+    __slots__ = ('thread', 'stop', 'exited', 'owns_capture')
+
+    def __init__(self):
+        self.thread: Optional[threading.Thread] = None
+        self.stop = threading.Event()
+        self.exited = False
+        self.owns_capture = False
+
 
 class CameraManager:
     """Manages video input sources and handles switching between drone receiver and laptop camera."""
@@ -22,9 +56,20 @@ class CameraManager:
         self.current_camera: Optional[cv2.VideoCapture] = None
         self.config: Optional[CameraConfig] = None
         self.is_initialized = False
-        self.last_frame_time = 0
+        # time.monotonic_ns() of the last successfully captured frame
+        self.last_frame_ns = 0
         self.connection_attempts = 0
         self.max_connection_attempts = 3
+        # Index -> time.monotonic_ns() at which it failed to open during fallback probing
+        self._dead_camera_indices: Dict[int, int] = {}
+
+        # Optional background reader (see set_async_capture): it keeps only the newest
+        # frame in a single slot and signals _frame_event whenever the slot changes
+        self.async_capture = False
+        self._reader: Optional[_Reader] = None
+        self._frame_event = threading.Event()
+        self._frame_lock = threading.Lock()
+        self._latest: Optional[Tuple[bool, Optional[np.ndarray]]] = None
         
         # Setup logging
         self.logger = logging.getLogger(__name__)
@@ -35,6 +80,7 @@ class CameraManager:
             self.logger.info(f"Initializing camera: {config.source_type} (device_id: {config.device_id})")
             
             # Release any existing camera
+            self._stop_reader()
             if self.current_camera is not None:
                 self.current_camera.release()
             
@@ -52,6 +98,8 @@ class CameraManager:
                 self.config = config
                 self.is_initialized = True
                 self.connection_attempts = 0
+                if self.async_capture:
+                    self._start_reader()
                 self.logger.info(f"Camera initialized successfully: {config.source_type}")
                 return True
             else:
@@ -65,54 +113,118 @@ class CameraManager:
     def _initialize_laptop_camera(self, config: CameraConfig) -> bool:
         """Initialize laptop camera using OpenCV."""
         try:
-            # Try to detect available laptop cameras
-            available_cameras = self._detect_laptop_cameras()
-            
-            if not available_cameras:
-                self.logger.error("No laptop cameras detected")
-                return False
-            
-            # Use specified device_id or first available camera
-            device_id = config.device_id if config.device_id in available_cameras else available_cameras[0]
-            
-            # Use Windows-optimized camera initialization if available
-            if windows_compat and windows_compat.is_windows:
-                backends = windows_compat.get_optimal_camera_backends()
-                for backend in backends:
-                    try:
-                        self.current_camera = cv2.VideoCapture(device_id, backend)
-                        if self.current_camera.isOpened():
-                            break
-                        self.current_camera.release()
-                    except Exception as e:
-                        self.logger.debug(f"Backend {backend} failed: {e}")
-                        continue
-                else:
-                    # Fallback to default
-                    self.current_camera = cv2.VideoCapture(device_id)
+            # A camera that worked recently for this device_id is opened directly,
+            # skipping enumeration; if it no longer works, fall back to a full scan
+            cached = self._load_cached_camera()
+            if cached is not None and cached[0] == config.device_id:
+                if self._open_laptop_camera(config, cached[0], cached[1]):
+                    self.logger.info(f"Reopened cached laptop camera {cached[0]}")
+                    return True
+
+            # Windows camera detection is cached, which goes stale on unplug/replug: re-detect
+            # when reconnecting after repeated read failures, or once the detected camera
+            # fails to open
+            if self.connection_attempts >= self.max_connection_attempts:
+                refresh_attempts = (True,)
+            elif windows_compat and windows_compat.is_windows:
+                refresh_attempts = (False, True)
             else:
-                self.current_camera = cv2.VideoCapture(device_id)
-            
-            if not self.current_camera.isOpened():
-                self.logger.error(f"Failed to open laptop camera {device_id}")
-                return False
-            
-            # Configure camera settings
-            self._configure_camera_settings(config)
-            
-            # Test frame capture
-            ret, frame = self.current_camera.read()
-            if not ret or frame is None:
-                self.logger.error("Failed to capture test frame from laptop camera")
-                return False
-            # Record time of successful frame so is_connected() sees recent activity
-            self.last_frame_time = time.time()
+                refresh_attempts = (False,)
 
-            return True
+            for refresh in refresh_attempts:
+                # Try to detect available laptop cameras
+                available_cameras = self._detect_laptop_cameras(refresh=refresh)
+                
+                if not available_cameras:
+                    self.logger.error("No laptop cameras detected")
+                    continue
+                
+                # Use specified device_id or first available camera
+                device_id = config.device_id if config.device_id in available_cameras else available_cameras[0]
+                if self._open_laptop_camera(config, device_id):
+                    return True
+            return False
             
         except Exception as e:
             self.logger.error(f"Error initializing laptop camera: {e}")
+            self._discard_camera()
             return False
+
+    def _open_laptop_camera(self, config: CameraConfig, device_id: int,
+                            preferred_backend: Optional[int] = None) -> bool:
+        """Open, configure and test-read one laptop camera, caching it on success."""
+        backend_used = None
+        # Use Windows-optimized camera initialization if available
+        if windows_compat and windows_compat.is_windows:
+            backends = windows_compat.get_optimal_camera_backends()
+            if preferred_backend in backends:
+                backends.remove(preferred_backend)
+                backends.insert(0, preferred_backend)
+            for backend in backends:
+                try:
+                    self.current_camera = cv2.VideoCapture(device_id, backend)
+                    if self.current_camera.isOpened():
+                        backend_used = backend
+                        break
+                    self.current_camera.release()
+                except Exception as e:
+                    self.logger.debug(f"Backend {backend} failed: {e}")
+                    continue
+            else:
+                # Fallback to default
+                self.current_camera = cv2.VideoCapture(device_id)
+        else:
+            self.current_camera = cv2.VideoCapture(device_id)
+        
+        if not self.current_camera.isOpened():
+            self.logger.error(f"Failed to open laptop camera {device_id}")
+            self._discard_camera()
+            return False
+        
+        # Configure camera settings
+        self._configure_camera_settings(config)
+        
+        # Test frame capture
+        ret, frame = self.current_camera.read()
+        if not ret or frame is None:
+            self.logger.error("Failed to capture test frame from laptop camera")
+            self._discard_camera()
+            return False
+        # Record time of successful frame so is_connected() sees recent activity
+        self.last_frame_ns = time.monotonic_ns()
+
+        self._save_cached_camera(device_id, backend_used)
+        return True
+
+    def _load_cached_camera(self) -> Optional[Tuple[int, Optional[int]]]:
+        """Return the (camera_id, backend) cached within the last hour, or None."""
+        try:
+            if time.time() - _CAMERA_CACHE_PATH.stat().st_mtime > _CAMERA_CACHE_MAX_AGE:
+                return None
+            with open(_CAMERA_CACHE_PATH, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            return int(cached['camera_id']), cached.get('backend')
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save_cached_camera(self, camera_id: int, backend: Optional[int]) -> None:
+        """Record the laptop camera that just opened; failures only cost the shortcut."""
+        try:
+            _CAMERA_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(_CAMERA_CACHE_PATH, 'w', encoding='utf-8') as f:
+                json.dump({'camera_id': camera_id, 'backend': backend}, f)
+        except OSError as e:
+            self.logger.debug(f"Could not write camera cache {_CAMERA_CACHE_PATH}: {e}")
+
+    def _discard_camera(self) -> None:
+        """Release a capture that failed to initialize right away instead of leaving the
+        device handle open until garbage collection (DirectShow then blocks reopening it)."""
+        camera, self.current_camera = self.current_camera, None
+        if camera is not None:
+            try:
+                camera.release()
+            except Exception:
+                pass
     
     def _initialize_drone_camera(self, config: CameraConfig) -> bool:
         """Initialize drone receiver connection with fallback mechanism."""
@@ -139,7 +251,7 @@ class CameraManager:
                         ret, frame = self.current_camera.read()
                         if ret and frame is not None:
                             # Record time of successful frame so is_connected() sees recent activity
-                            self.last_frame_time = time.time()
+                            self.last_frame_ns = time.monotonic_ns()
                             self.logger.info(f"Drone camera connected successfully: {method}")
                             return True
                         time.sleep(0.1)
@@ -156,12 +268,15 @@ class CameraManager:
             self.logger.error(f"Error initializing drone camera: {e}")
             return False
     
-    def _detect_laptop_cameras(self) -> List[int]:
-        """Detect available laptop cameras."""
+    def _detect_laptop_cameras(self, refresh: bool = False) -> List[int]:
+        """Detect available laptop cameras.
+
+        refresh bypasses the cached Windows detection and re-probes every index.
+        """
         # Use Windows-specific detection if available
         if windows_compat and windows_compat.is_windows:
             try:
-                windows_cameras = windows_compat.detect_windows_cameras()
+                windows_cameras = windows_compat.detect_windows_cameras(refresh=refresh)
                 if windows_cameras:
                     camera_ids = [cam['id'] for cam in windows_cameras]
                     self.logger.info(f"Windows-detected cameras: {camera_ids}")
@@ -170,26 +285,54 @@ class CameraManager:
                 self.logger.debug(f"Windows camera detection failed, using fallback: {e}")
         
         # Fallback to standard detection
-        available_cameras = []
-        
         # Test camera indices 0-9 (extended range for Windows)
-        max_cameras = 10 if platform.system().lower() == 'windows' else 6
-        
-        for i in range(max_cameras):
+        is_windows = IS_WINDOWS
+        max_cameras = 10 if is_windows else 6
+
+        def _probe(i: int) -> Tuple[bool, bool]:
+            """Return (opened, delivers frames) for index i."""
+            # Use DirectShow backend on Windows for better compatibility
+            cap = cv2.VideoCapture(i, cv2.CAP_DSHOW) if is_windows else cv2.VideoCapture(i)
             try:
-                # Use DirectShow backend on Windows for better compatibility
-                if platform.system().lower() == 'windows':
-                    cap = cv2.VideoCapture(i, cv2.CAP_DSHOW)
-                else:
-                    cap = cv2.VideoCapture(i)
-                    
-                if cap.isOpened():
-                    ret, frame = cap.read()
-                    if ret and frame is not None:
-                        available_cameras.append(i)
+                if not cap.isOpened():
+                    return False, False
+                # Don't let the driver queue frames while we only need one
+                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                # grab() proves the device delivers frames without decoding one; the
+                # chosen camera's first frame is still fully read during initialization
+                return True, cap.grab()
+            finally:
                 cap.release()
-            except Exception:
-                continue
+
+        # Skip indices that recently failed to open (e.g. on recovery); entries expire, and a
+        # refresh or a probe that finds no camera at all forgets them to catch hot-plugs
+        dead = self._dead_camera_indices
+        now_ns = time.monotonic_ns()
+        if refresh:
+            dead.clear()
+        else:
+            for i in [i for i, failed_ns in dead.items() if now_ns - failed_ns > _DEAD_CAMERA_TTL_NS]:
+                del dead[i]
+
+        # Opening an index can block for a long time (notably DirectShow), so all
+        # indices are probed concurrently; results are collected in index order
+        indices = [i for i in range(max_cameras) if i not in dead]
+        available_cameras = []
+        if indices:
+            with ThreadPoolExecutor(max_workers=len(indices), thread_name_prefix="camera-probe") as executor:
+                futures = [executor.submit(_probe, i) for i in indices]
+                for i, future in zip(indices, futures):
+                    try:
+                        opened, delivers_frames = future.result()
+                    except Exception:
+                        continue
+                    if not opened:
+                        dead[i] = now_ns
+                    elif delivers_frames:
+                        available_cameras.append(i)
+
+        if not available_cameras:
+            dead.clear()
         
         self.logger.info(f"Detected laptop cameras: {available_cameras}")
         return available_cameras
@@ -200,6 +343,12 @@ class CameraManager:
             return
         
         try:
+            # Ask USB devices for MJPEG before choosing the size: V4L2 only offers the larger
+            # resolutions/frame rates in MJPEG. Windows does this in apply_capture_low_latency;
+            # network streams ignore the request.
+            if not (windows_compat and windows_compat.is_windows):
+                self.current_camera.set(cv2.CAP_PROP_FOURCC, _FOURCC_MJPG)
+
             # Set resolution
             width, height = config.resolution
             self.current_camera.set(cv2.CAP_PROP_FRAME_WIDTH, width)
@@ -212,23 +361,8 @@ class CameraManager:
             if windows_compat and windows_compat.is_windows:
                 optimizations = windows_compat.optimize_for_windows_performance()
                 
-                # Set buffer size based on Windows optimizations
-                buffer_size = optimizations.get('buffer_size', 1)
-                self.current_camera.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
-                
-                # Enable MJPEG compression for better performance
-                if optimizations.get('use_mjpeg', False):
-                    try:
-                        self.current_camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
-                    except Exception:
-                        pass
-                
-                # Disable auto-exposure for consistent FPS
-                if not optimizations.get('auto_exposure', True):
-                    try:
-                        self.current_camera.set(cv2.CAP_PROP_AUTO_EXPOSURE, 0.25)  # Manual exposure
-                    except Exception:
-                        pass
+                # Configured buffer depth, MJPEG and manual exposure/white balance
+                windows_compat.apply_capture_low_latency(self.current_camera, config.buffer_size)
                 
                 # Enable hardware acceleration if available
                 if optimizations.get('enable_hardware_acceleration', False):
@@ -243,8 +377,11 @@ class CameraManager:
                 self.current_camera.set(cv2.CAP_PROP_FPS, target_fps)
                 
             else:
-                # Set buffer size to reduce latency
-                self.current_camera.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                # Set buffer size to reduce latency (not every backend honours it)
+                try:
+                    self.current_camera.set(cv2.CAP_PROP_BUFFERSIZE, config.buffer_size)
+                except Exception as e:
+                    self.logger.debug(f"Capture buffer size not applied: {e}")
             
             self.logger.info(f"Camera configured: {width}x{height} @ {config.fps}fps")
             
@@ -258,7 +395,7 @@ class CameraManager:
             return None
         
         try:
-            ret, frame = self.current_camera.read()
+            ret, frame = self._read_next()
             
             if not ret or frame is None:
                 self.logger.warning("Failed to capture frame")
@@ -268,7 +405,7 @@ class CameraManager:
                 if self.connection_attempts >= self.max_connection_attempts:
                     self.logger.info("Attempting to reconnect camera")
                     if self.config and self.initialize_camera(self.config):
-                        ret, frame = self.current_camera.read()
+                        ret, frame = self._read_next()
                         if ret and frame is not None:
                             return frame
                 
@@ -276,7 +413,7 @@ class CameraManager:
             
             # Reset connection attempts on successful frame
             self.connection_attempts = 0
-            self.last_frame_time = time.time()
+            self.last_frame_ns = time.monotonic_ns()
             
             return frame
             
@@ -284,12 +421,106 @@ class CameraManager:
             self.logger.error(f"Exception during frame capture: {e}")
             return None
     
+    def set_async_capture(self, enabled: bool) -> None:
+        """Read frames on a background thread so get_frame returns the newest frame.
+
+        Capture then keeps running while the caller is busy (e.g. with inference), so
+        the frame handed out is the latest one rather than one queued behind it; frames
+        nobody asked for are dropped. Applies to the current and any later camera.
+        """
+        self.async_capture = enabled
+        if not enabled:
+            was_initialized = self.is_initialized
+            self._stop_reader()
+            if was_initialized and not self.is_initialized and self.config is not None:
+                # The blocked reader kept the capture; reopen the camera for direct reads
+                self.initialize_camera(self.config)
+        elif self.is_initialized and self.current_camera is not None:
+            self._start_reader()
+
+    def _start_reader(self) -> None:
+        if self._reader is not None:
+            return
+        reader = _Reader()
+        with self._frame_lock:
+            self._frame_event.clear()
+            self._latest = None
+        reader.thread = threading.Thread(target=self._read_loop, args=(self.current_camera, reader),
+                                         name="camera-reader", daemon=True)
+        self._reader = reader
+        reader.thread.start()
+
+    def _stop_reader(self) -> None:
+        """Stop the background reader before its capture is released or read directly.
+
+        If the reader is still blocked in read() (e.g. a stalled network stream) after
+        the timeout, it keeps the capture and releases it when read() returns;
+        current_camera is detached so nothing else touches that capture meanwhile.
+        """
+        reader, self._reader = self._reader, None
+        if reader is None:
+            return
+        with self._frame_lock:
+            # Set under the lock so the reader cannot publish another frame after this
+            reader.stop.set()
+            self._latest = None
+            self._frame_event.clear()
+        reader.thread.join(timeout=2.0)
+        with self._frame_lock:
+            if not reader.exited:
+                reader.owns_capture = True
+        if reader.owns_capture:
+            self.logger.warning("Camera reader still blocked in read(); leaving the capture to it")
+            self.current_camera = None
+            self.is_initialized = False
+
+    def _read_loop(self, capture: cv2.VideoCapture, reader: _Reader) -> None:
+        """Background reader: overwrite the single frame slot with each read result."""
+        stop = reader.stop
+        try:
+            while not stop.is_set():
+                try:
+                    ret, frame = capture.read()
+                except Exception:
+                    ret, frame = False, None
+                with self._frame_lock:
+                    if stop.is_set():
+                        break
+                    self._latest = (ret, frame)
+                    self._frame_event.set()
+                if not ret:
+                    # Let get_frame see the failure and decide on reconnecting; a stop request
+                    # (release / switch / reconnect) ends the wait immediately
+                    stop.wait(0.01)
+        finally:
+            with self._frame_lock:
+                reader.exited = True
+                owns_capture = reader.owns_capture
+            if owns_capture:
+                try:
+                    capture.release()
+                except Exception:
+                    pass
+
+    def _read_next(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """Read from the camera directly, or take the newest result from the reader."""
+        if self._reader is None:
+            return self.current_camera.read()
+        timeout = self.config.connection_timeout if self.config else 5.0
+        if not self._frame_event.wait(timeout):
+            return False, None
+        with self._frame_lock:
+            latest, self._latest = self._latest, None
+            self._frame_event.clear()
+        return latest if latest is not None else (False, None)
+
     def switch_source(self, new_config: CameraConfig) -> bool:
         """Changes between camera sources."""
         try:
             self.logger.info(f"Switching camera source from {self.config.source_type if self.config else 'None'} to {new_config.source_type}")
             
             # Release current camera
+            self._stop_reader()
             if self.current_camera is not None:
                 self.current_camera.release()
                 self.current_camera = None
@@ -328,8 +559,7 @@ class CameraManager:
 
             # Check if we've received frames recently (within last 5 seconds).
             # Avoid attempting a blocking read here; return False if frames are stale.
-            current_time = time.time()
-            if current_time - self.last_frame_time > 5.0:
+            if time.monotonic_ns() - self.last_frame_ns > _STALE_FRAME_NS:
                 return False
 
             return True
@@ -360,6 +590,7 @@ class CameraManager:
     def release(self):
         """Release camera resources."""
         try:
+            self._stop_reader()
             if self.current_camera is not None:
                 self.current_camera.release()
                 self.current_camera = None
@@ -2,13 +2,29 @@
 
 import numpy as np
 import logging
-try:
-    # Avoid importing heavy ML libraries at module import time in test environments.
-    from ultralytics import YOLO  # type: ignore
-except Exception:
-    YOLO = None
-from typing import List, Optional
-from .models import DetectionResult
+from typing import Dict, List, Optional
+from .models import DetectionBatch
+
+# ultralytics and torch take seconds to import; they are loaded on first use
+# (load_model / prepare_input_buffers) rather than when this module is imported.
+YOLO = None
+torch = None
+
+# Loaded (and warmed-up) models by path, shared by every HumanDetector in the process so
+# that re-creating a detector (e.g. on component restart) does not reload the weights
+_model_cache: Dict[str, object] = {}
+
+
+def _import_torch():
+    """Import torch on first use; returns the module, or None if unavailable."""
+    global torch
+    if torch is None:
+        try:
+            import torch as _torch  # type: ignore
+        except Exception:
+            return None
+        torch = _torch
+    return torch
 
 
 class HumanDetector:
@@ -17,12 +33,29 @@ class HumanDetector:
     # COCO dataset class ID for person
     PERSON_CLASS_ID = 0
     PERSON_CLASS_NAME = "person"
+
+    # False-positive heuristics (windows, reflections), relative to the frame:
+    MIN_AREA_RATIO = 0.02  # box must cover at least 2% of frame area
+    MIN_HEIGHT_RATIO = 0.12  # box height must be at least 12% of frame height
+    MIN_ASPECT = 0.6  # height/width ratio (persons usually taller than wide)
     
     def __init__(self, confidence_threshold: float = 0.5):
         self.model = None
         self.confidence_threshold = confidence_threshold
         self.is_loaded = False
         self.logger = logging.getLogger(__name__)
+
+        # Persistent pinned-host / device input tensors for the CUDA zero-copy path
+        self._input_pinned = None
+        self._input_dev = None
+        self._input_host_view: Optional[np.ndarray] = None
+        # FP16 inference, decided in load_model (CUDA only). Passed on every call, including
+        # the warm-up, because ultralytics fixes the model precision on its first call.
+        self._half = False
+
+        # (min_area, min_height) in pixels for the last frame size, recomputed only when it changes
+        self._threshold_size = (0, 0)
+        self._size_thresholds = (0.0, 0.0)
     
     def load_model(self, model_path: str = "yolov8n.pt") -> bool:
         """
@@ -35,18 +68,41 @@ class HumanDetector:
             bool: True if model loaded successfully, False otherwise
         """
         try:
+            torch_module = _import_torch()
+            self._half = bool(torch_module is not None and torch_module.cuda.is_available())
+
+            cached = _model_cache.get(model_path)
+            if cached is not None:
+                self.model = cached
+                self.is_loaded = True
+                self.logger.info(f"Reusing loaded YOLOv8 model {model_path}")
+                return True
+
             self.logger.info(f"Loading YOLOv8 model from {model_path}")
+            global YOLO
             if YOLO is None:
-                # Attempt to import lazily now
+                # Import lazily now
                 try:
                     from ultralytics import YOLO as _YOLO  # type: ignore
-                    self.model = _YOLO(model_path)
                 except Exception as ie:
                     self.logger.error(f"Failed to import ultralytics.YOLO: {ie}")
                     self.is_loaded = False
                     return False
-            else:
-                self.model = YOLO(model_path)
+                YOLO = _YOLO
+            self.model = YOLO(model_path)
+
+            # One dummy inference so the first real frame doesn't pay for lazy
+            # initialization (layer fusion, kernel selection)
+            try:
+                self.model(np.zeros((480, 640, 3), dtype=np.uint8), verbose=False, half=self._half)
+            except Exception as e:
+                self.logger.debug(f"Model warm-up failed: {e}")
+            _model_cache[model_path] = self.model
+
+            # Likewise for the coordinate fix used by filter_detections: importing it
+            # compiles (or loads from the on-disk cache) its numba kernel
+            from .windows_coordinate_fix import get_coordinate_fix
+            get_coordinate_fix()
 
             self.is_loaded = True
             self.logger.info("YOLOv8 model loaded successfully")
@@ -56,7 +112,7 @@ class HumanDetector:
             self.is_loaded = False
             return False
     
-    def detect_humans(self, frame: np.ndarray) -> List[DetectionResult]:
+    def detect_humans(self, frame: np.ndarray) -> DetectionBatch:
         """
         Processes frame and returns detection results for humans only.
         
@@ -64,36 +120,147 @@ class HumanDetector:
             frame: Input video frame as numpy array
             
         Returns:
-            List[DetectionResult]: List of human detection results
+            DetectionBatch: Human detection results (iterates as DetectionResult)
         """
         if not self.is_loaded or self.model is None:
             self.logger.warning("Model not loaded, cannot perform detection")
-            return []
+            return DetectionBatch.empty()
         
         if frame is None or frame.size == 0:
             self.logger.warning("Invalid frame provided for detection")
-            return []
+            return DetectionBatch.empty()
         
         try:
             # Store original frame dimensions for coordinate scaling
             original_height, original_width = frame.shape[:2]
-            self.logger.debug(f"Processing frame: {original_width}x{original_height}")
+            self.logger.debug("Processing frame: %dx%d", original_width, original_height)
             
             # Run YOLOv8 inference on the frame
             # YOLOv8 automatically handles resizing and coordinate scaling
-            results = self.model(frame, verbose=False)
+            results = self.model(frame, verbose=False, half=self._half)
             
             # Filter and convert detections to our format
             human_detections = self.filter_detections(results[0], original_width, original_height)
             
-            self.logger.debug(f"Detected {len(human_detections)} humans in frame")
+            self.logger.debug("Detected %d humans in frame", len(human_detections))
             return human_detections
             
         except Exception as e:
             self.logger.error(f"Error during detection processing: {str(e)}")
-            return []
+            return DetectionBatch.empty()
     
-    def filter_detections(self, detections, frame_width: int, frame_height: int) -> List[DetectionResult]:
+    def detect_humans_batch(self, frames: List[np.ndarray]) -> List[DetectionBatch]:
+        """
+        Runs detection on several frames with a single model call.
+
+        One batched forward pass amortizes per-call dispatch and kernel launch
+        overhead across the frames (e.g. a burst of probe frames).
+
+        Args:
+            frames: Input video frames as numpy arrays
+
+        Returns:
+            List[DetectionBatch]: Human detection results, one per input frame
+        """
+        if not self.is_loaded or self.model is None:
+            self.logger.warning("Model not loaded, cannot perform detection")
+            return [DetectionBatch.empty() for _ in frames]
+
+        valid = [i for i, frame in enumerate(frames) if frame is not None and frame.size > 0]
+        output = [DetectionBatch.empty() for _ in frames]
+        if not valid:
+            return output
+
+        try:
+            results = self.model([frames[i] for i in valid], verbose=False, half=self._half)
+            for i, result in zip(valid, results):
+                height, width = frames[i].shape[:2]
+                output[i] = self.filter_detections(result, width, height)
+            return output
+
+        except Exception as e:
+            self.logger.error(f"Error during batched detection processing: {str(e)}")
+            return [DetectionBatch.empty() for _ in frames]
+
+    def prepare_input_buffers(self, width: int, height: int) -> bool:
+        """
+        Pre-allocates pinned host and device input tensors for CUDA inference.
+
+        Args:
+            width: Frame width the buffers are sized for
+            height: Frame height the buffers are sized for
+
+        Returns:
+            bool: True if the zero-copy path is available, False otherwise
+        """
+        self._input_pinned = None
+        self._input_dev = None
+        self._input_host_view = None
+
+        torch = _import_torch()
+        if torch is None or not torch.cuda.is_available():
+            return False
+
+        # Tensor inputs bypass YOLO letterboxing, so dimensions must match the model stride
+        if width % 32 or height % 32:
+            self.logger.info(f"Zero-copy input disabled: {width}x{height} is not a multiple of 32")
+            return False
+
+        try:
+            # Half precision halves the host-to-device copy and runs on tensor cores
+            dtype = torch.float16 if self._half else torch.float32
+            self._input_pinned = torch.empty((1, 3, height, width), dtype=dtype, pin_memory=True)
+            self._input_dev = torch.empty_like(self._input_pinned, device='cuda')
+            self._input_host_view = self._input_pinned.numpy()[0]
+            self.logger.info(f"Allocated pinned {dtype} input buffers for {width}x{height} frames")
+            return True
+        except Exception as e:
+            self.logger.warning(f"Failed to allocate pinned input buffers: {e}")
+            self._input_pinned = None
+            self._input_dev = None
+            self._input_host_view = None
+            return False
+
+    def detect_humans_zero_copy(self, frame: np.ndarray) -> DetectionBatch:
+        """
+        Runs detection by writing the frame into persistent pinned/device tensors.
+
+        Falls back to detect_humans() when the buffers are unavailable or the
+        frame size does not match the one they were allocated for.
+
+        Args:
+            frame: Input BGR video frame as numpy array
+
+        Returns:
+            DetectionBatch: Human detection results (iterates as DetectionResult)
+        """
+        host = self._input_host_view
+        if (host is None or frame is None or frame.ndim != 3
+                or frame.shape[0] != host.shape[1] or frame.shape[1] != host.shape[2]):
+            return self.detect_humans(frame)
+
+        if not self.is_loaded or self.model is None:
+            self.logger.warning("Model not loaded, cannot perform detection")
+            return DetectionBatch.empty()
+
+        try:
+            original_height, original_width = frame.shape[:2]
+            # BGR HWC uint8 -> RGB CHW float in [0, 1], written straight into pinned memory
+            np.multiply(frame[..., ::-1].transpose(2, 0, 1), 1.0 / 255.0, out=host, casting='unsafe')
+            self._input_dev.copy_(self._input_pinned, non_blocking=True)
+
+            with torch.no_grad():
+                results = self.model(self._input_dev, verbose=False, half=self._half)
+
+            human_detections = self.filter_detections(results[0], original_width, original_height)
+            self.logger.debug("Detected %d humans in frame (zero-copy)", len(human_detections))
+            return human_detections
+
+        except Exception as e:
+            self.logger.error(f"Error during zero-copy detection processing: {str(e)}")
+            return DetectionBatch.empty()
+
+    def filter_detections(self, detections, frame_width: int, frame_height: int) -> DetectionBatch:
         """
         Filters results for human class only and applies confidence threshold.
         
@@ -103,95 +270,112 @@ class HumanDetector:
             frame_height: Original frame height for coordinate validation
             
         Returns:
-            List[DetectionResult]: Filtered human detection results
+            DetectionBatch: Filtered human detection results
         """
-        human_detections = []
-        
         if detections.boxes is None:
-            return human_detections
+            return DetectionBatch.empty()
         
         try:
-            # Extract detection data
-            boxes = detections.boxes.xyxy.cpu().numpy()  # x1, y1, x2, y2
-            confidences = detections.boxes.conf.cpu().numpy()
-            class_ids = detections.boxes.cls.cpu().numpy().astype(int)
+            # Extract detection data with a single device-to-host copy of the
+            # (N, 6) or (N, 7) result rows: x1, y1, x2, y2, [track id], conf, cls
+            data = detections.boxes.data.cpu().numpy()
+            boxes = data[:, :4]  # x1, y1, x2, y2
+            confidences = data[:, -2]
+            class_ids = data[:, -1].astype(int)
             
-            self.logger.debug(f"Raw detections: {len(boxes)} boxes found for frame {frame_width}x{frame_height}")
+            self.logger.debug("Raw detections: %d boxes found for frame %dx%d", len(boxes), frame_width, frame_height)
             
             # Check if coordinates might be normalized (0-1 range) vs pixel coordinates
+            # (one reduction over the box columns, converted to a Python float once)
             if len(boxes) > 0:
-                max_coord = np.max(boxes)
-                self.logger.debug(f"Maximum coordinate value: {max_coord}")
+                max_coord = float(boxes.max())
+                self.logger.debug("Maximum coordinate value: %s", max_coord)
                 if max_coord <= 1.0:
                     self.logger.warning("Coordinates appear to be normalized (0-1), but YOLOv8 should return pixel coordinates")
             
-            # Apply Windows coordinate fix if needed
-            from .windows_coordinate_fix import WindowsCoordinateFix
-            coordinate_fix = WindowsCoordinateFix()
-            
-            # Filter for human detections with sufficient confidence
-            for i, (box, confidence, class_id) in enumerate(zip(boxes, confidences, class_ids)):
-                if (class_id == self.PERSON_CLASS_ID and 
-                    confidence >= self.confidence_threshold):
-                    
-                    # Debug: Log raw coordinates before processing
-                    x1, y1, x2, y2 = box
-                    self.logger.debug(f"Raw detection {i}: bbox=({x1:.2f}, {y1:.2f}, {x2:.2f}, {y2:.2f}), conf={confidence:.3f}")
-                    
-                    # Apply coordinate fix (handles scaling and Windows-specific issues)
-                    fixed_boxes = coordinate_fix.fix_coordinates([(x1, y1, x2, y2)], frame_width, frame_height)
-                    
-                    if not fixed_boxes:
-                        self.logger.warning(f"Detection {i} rejected by coordinate fix")
-                        continue
-                        
-                    x1, y1, x2, y2 = fixed_boxes[0]
-                    self.logger.debug(f"Fixed detection {i}: bbox=({x1}, {y1}, {x2}, {y2})")
+            # Apply Windows coordinate fix once to all human candidates with sufficient confidence
+            from .windows_coordinate_fix import get_coordinate_fix
+            coordinate_fix = get_coordinate_fix()
+            candidates = np.flatnonzero((class_ids == self.PERSON_CLASS_ID) &
+                                        (confidences >= self.confidence_threshold))
+            # fixed/fixed_valid are views of the fixer's reused buffers; consumed within this loop
+            fixed, fixed_valid = coordinate_fix.fix_box_array(
+                boxes[candidates, :4].astype(np.float64), frame_width, frame_height)
+            debug = self.logger.isEnabledFor(logging.DEBUG)
+
+            if self._threshold_size != (frame_width, frame_height):
+                self._threshold_size = (frame_width, frame_height)
+                self._size_thresholds = (frame_width * frame_height * self.MIN_AREA_RATIO,
+                                         frame_height * self.MIN_HEIGHT_RATIO)
+            min_area, min_height = self._size_thresholds
+            min_aspect = self.MIN_ASPECT
+
+            # Loop invariants bound to locals for the per-box loop
+            log_debug = self.logger.debug
+            log_warning = self.logger.warning
+
+            # Positions (into candidates) of detections that pass every check
+            kept = []
+            keep = kept.append
+
+            # Iterate plain Python lists converted once, rather than indexing ndarrays per box
+            for j, (i, (x1, y1, x2, y2), valid) in enumerate(zip(candidates.tolist(), fixed.tolist(),
+                                                                 fixed_valid.tolist())):
+                if debug:
+                    rx1, ry1, rx2, ry2 = boxes[i, :4].tolist()
+                    log_debug("Raw detection %d: bbox=(%.2f, %.2f, %.2f, %.2f), conf=%.3f",
+                              i, rx1, ry1, rx2, ry2, confidences[i])
+                
+                if not valid:
+                    log_warning("Detection %d rejected by coordinate fix", i)
+                    continue
                     
-                    # Validate bounding box dimensions
-                    if x2 > x1 and y2 > y1:
-                        # Additional heuristics to reduce false positives (windows, reflections)
-                        box_w = x2 - x1
-                        box_h = y2 - y1
-                        frame_area = frame_width * frame_height
-                        box_area = box_w * box_h
-
-                        # Conservative thresholds (relative to frame):
-                        min_area_ratio = 0.02  # box must cover at least 2% of frame area
-                        min_height_ratio = 0.12  # box height must be at least 12% of frame height
-                        min_aspect = 0.6  # height/width ratio (persons usually taller than wide)
-
-                        if box_area < frame_area * min_area_ratio:
-                            self.logger.debug(f"Rejected detection {i}: area too small ({box_area} < {frame_area * min_area_ratio})")
-                            continue
-
-                        if box_h < frame_height * min_height_ratio:
-                            self.logger.debug(f"Rejected detection {i}: height too small ({box_h} < {frame_height * min_height_ratio})")
-                            continue
-
-                        if (box_h / max(1, box_w)) < min_aspect:
-                            self.logger.debug(f"Rejected detection {i}: aspect ratio too small ({box_h}/{box_w} < {min_aspect})")
-                            continue
-
-                        self.logger.debug(f"Final detection {i}: bbox=({x1}, {y1}, {x2}, {y2}), size=({x2-x1}x{y2-y1}), conf={confidence:.3f}")
-                        
-                        detection = DetectionResult(
-                            bbox=(x1, y1, x2, y2),
-                            confidence=float(confidence),
-                            class_id=class_id,
-                            class_name=self.PERSON_CLASS_NAME
-                        )
-                        # Attach raw bbox as reported by the model for debugging
-                        detection.raw_bbox = (float(box[0]), float(box[1]), float(box[2]), float(box[3]))
-                        
-                        human_detections.append(detection)
-                    else:
-                        self.logger.warning(f"Invalid bounding box detected: ({x1}, {y1}, {x2}, {y2})")
-            
+                if debug:
+                    log_debug("Fixed detection %d: bbox=(%d, %d, %d, %d)", i, x1, y1, x2, y2)
+                
+                # Valid rows from the fix already have x2 > x1 and y2 > y1 (at least 10 px).
+                # Additional heuristics to reduce false positives (windows, reflections)
+                box_w = x2 - x1
+                box_h = y2 - y1
+                box_area = box_w * box_h
+
+                if box_area < min_area:
+                    log_debug("Rejected detection %d: area too small (%d < %s)", i, box_area, min_area)
+                    continue
+
+                if box_h < min_height:
+                    log_debug("Rejected detection %d: height too small (%d < %s)", i, box_h, min_height)
+                    continue
+
+                if (box_h / max(1, box_w)) < min_aspect:
+                    log_debug("Rejected detection %d: aspect ratio too small (%d/%d < %s)", i, box_h, box_w, min_aspect)
+                    continue
+
+                if debug:
+                    log_debug("Final detection %d: bbox=(%d, %d, %d, %d), size=(%dx%d), conf=%.3f",
+                              i, x1, y1, x2, y2, box_w, box_h, confidences[i])
+                
+                keep(j)
+
+            if not kept:
+                return DetectionBatch.empty()
+
+            # Gather kept rows in one indexing pass (before the fixer's buffers are reused)
+            selected = candidates[kept]
+            count = len(kept)
+            return DetectionBatch(
+                boxes=fixed[kept].astype(np.int32),
+                scores=confidences[selected].astype(np.float32),
+                class_ids=np.full(count, self.PERSON_CLASS_ID, dtype=np.int32),
+                names=[self.PERSON_CLASS_NAME] * count,
+                # Raw bbox as reported by the model, kept for debugging
+                raw_boxes=boxes[selected, :4].astype(np.float32),
+            )
+        
         except Exception as e:
             self.logger.error(f"Error filtering detections: {str(e)}")
-        
-        return human_detections
+            return DetectionBatch.empty()
+
     
     def get_confidence_threshold(self) -> float:
         """Returns current confidence threshold."""
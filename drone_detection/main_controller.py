@@ -4,10 +4,14 @@ import logging
 import time
 import signal
 import traceback
-import platform
-from typing import Optional, Dict, Any
+from collections import Counter
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Mapping, Callable, List
 from enum import Enum
 
+import cv2
+
 from .camera_manager import CameraManager
 from .human_detector import HumanDetector
 from .display_manager import DisplayManager
@@ -16,9 +20,12 @@ from .models import CameraConfig, AppState
 
 # Import Windows compatibility utilities
 try:
-    from .windows_compat import ensure_windows_compatibility
+    from .windows_compat import IS_WINDOWS, ensure_windows_compatibility, get_windows_compat
+    windows_compat = get_windows_compat() if IS_WINDOWS else None
 except ImportError:
+    IS_WINDOWS = False
     ensure_windows_compatibility = None
+    windows_compat = None
 
 # Import Windows-safe display manager
 try:
@@ -26,6 +33,9 @@ try:
 except ImportError:
     WindowsSafeDisplayManager = None
 
+# OpenCV constant bound once to avoid a per-frame module attribute lookup
+_INTER_AREA = cv2.INTER_AREA
+
 
 class ErrorType(Enum):
     CAMERA_CONNECTION_FAILED = "camera_connection_failed"
@@ -53,6 +63,11 @@ class MainController:
     - Attempt recovery strategies when errors accumulate
     """
 
+    # Display manager built when none was injected, chosen once at import time: the
+    # Windows-safe (OpenCV-only) manager on Windows avoids Tkinter threading issues
+    display_manager_cls = (WindowsSafeDisplayManager if IS_WINDOWS and WindowsSafeDisplayManager
+                           else DisplayManager)
+
     def __init__(self):
         # Core components
         self.camera_manager: Optional[CameraManager] = None
@@ -60,6 +75,10 @@ class MainController:
         self.display_manager: Optional[DisplayManager] = None
         self.performance_monitor: Optional[PerformanceMonitor] = None
 
+        # When set, process_frame hands (frame, detections) to this callable instead of
+        # displaying them, so display can run on another thread (see main.py)
+        self.frame_sink: Optional[Callable[[Any, List], None]] = None
+
         # Application state
         self.app_state = AppState(
             is_running=False,
@@ -72,8 +91,12 @@ class MainController:
         # Error handling configuration
         self.max_consecutive_errors = 5
         self.consecutive_errors = 0
-        self.error_counts: Dict[ErrorType, int] = {error_type: 0 for error_type in ErrorType}
-        self.last_successful_frame_time = time.time()
+        self.error_counts: Counter[ErrorType] = Counter()
+        # Same counts keyed by ErrorType.value, kept in step with error_counts for status reads
+        self._error_counts_view: Dict[str, int] = {error_type.value: 0 for error_type in ErrorType}
+        # Monotonic timestamp (ns) of the last successfully processed frame
+        self._last_ok_ns = time.monotonic_ns()
+        self._frame_timeout_ns = 30_000_000_000  # 30 seconds without a good frame triggers recovery
         self.recovery_attempts = 0
         self.max_recovery_attempts = 3
 
@@ -103,6 +126,13 @@ class MainController:
         self._error_log_intervals: Dict[ErrorType, float] = {error_type: self._error_log_base_interval for error_type in ErrorType}
         self._error_log_max_interval = 60.0  # cap interval
 
+        # Status fields reused across get_system_status calls, which return read-only copies
+        self._status_cache: Dict[str, Any] = {'error_counts': MappingProxyType(self._error_counts_view)}
+        self._status_dirty = True
+
+        # Bound OpenCV resize used for quality-based downscaling in process_frame
+        self._cv2_resize = cv2.resize
+
         # Setup logging and signal handlers
         self.logger = self._setup_logging()
         self._setup_signal_handlers()
@@ -165,6 +195,10 @@ class MainController:
             if not self._initialize_performance_monitor():
                 return False
 
+            # The model and other startup objects live for the whole session; keep them out of GC scans
+            if self.performance_monitor:
+                self.performance_monitor.freeze_long_lived()
+
             self.logger.info("All components initialized successfully")
             return True
         except Exception as e:
@@ -172,6 +206,7 @@ class MainController:
             return False
 
     def _initialize_camera_manager(self) -> bool:
+        self._status_dirty = True
         try:
             self.camera_manager = CameraManager()
             self.logger.info("Attempting to initialize drone camera...")
@@ -193,12 +228,16 @@ class MainController:
             return False
 
     def _initialize_human_detector(self) -> bool:
+        self._status_dirty = True
         try:
             self.human_detector = HumanDetector(confidence_threshold=0.5)
             if not self.human_detector.load_model():
                 self._handle_error(ErrorType.MODEL_LOADING_FAILED, "Failed to load YOLOv8 model. Please ensure the model file is available.")
                 return False
             self.app_state.detection_enabled = True
+            if self.camera_manager and self.camera_manager.config:
+                width, height = self.camera_manager.config.resolution
+                self.human_detector.prepare_input_buffers(width, height)
             self.logger.info("Human detector initialized successfully")
             return True
         except Exception as e:
@@ -209,17 +248,14 @@ class MainController:
         try:
             # If a display manager was pre-set (e.g. GUI injection), keep it.
             if self.display_manager is None:
-                # Use Windows-safe display manager on Windows to avoid Tkinter threading issues
-                if platform.system().lower() == 'windows':
-                    if WindowsSafeDisplayManager:
-                        self.display_manager = WindowsSafeDisplayManager()
-                        self.logger.info("Using Windows-safe display manager (OpenCV-based)")
-                    else:
+                self.display_manager = self.display_manager_cls()
+                if self.display_manager_cls is DisplayManager:
+                    if IS_WINDOWS:
                         self.logger.warning("WindowsSafeDisplayManager not available, using standard display")
-                        self.display_manager = DisplayManager()
+                    else:
+                        self.logger.info("Using standard display manager")
                 else:
-                    self.display_manager = DisplayManager()
-                    self.logger.info("Using standard display manager")
+                    self.logger.info(f"Using {self.display_manager_cls.__name__}")
             self.logger.info("Display manager initialized successfully")
             return True
         except Exception as e:
@@ -248,26 +284,29 @@ class MainController:
             self.app_state.is_running = True
             self.logger.info("System started successfully, entering main loop")
 
+            # Capture and inference both run on this thread; raise only it, not the whole process
+            if windows_compat and windows_compat.is_windows:
+                windows_compat.elevate_current_thread()
+
             while self.app_state.is_running:
                 try:
-                    if not self.process_frame():
+                    now_ns = time.monotonic_ns()
+                    if self.process_frame():
+                        self.consecutive_errors = 0
+                        self._last_ok_ns = now_ns
+                    else:
                         self.consecutive_errors += 1
+
+                    # Both recovery triggers are almost always false; test them in one condition
+                    if (self.consecutive_errors >= self.max_consecutive_errors
+                            or now_ns - self._last_ok_ns > self._frame_timeout_ns):
                         if self.consecutive_errors >= self.max_consecutive_errors:
                             self.logger.error(f"Too many consecutive errors ({self.consecutive_errors}), attempting recovery")
-                            if not self._attempt_recovery():
-                                self.logger.error("Recovery failed, shutting down")
-                                break
-                    else:
-                        self.consecutive_errors = 0
-                        self.last_successful_frame_time = time.time()
-
-                    if time.time() - self.last_successful_frame_time > 30:
-                        self.logger.warning("No successful frames for 30 seconds, attempting recovery")
+                        else:
+                            self.logger.warning("No successful frames for 30 seconds, attempting recovery")
                         if not self._attempt_recovery():
-                            self.logger.error("Recovery failed after timeout, shutting down")
+                            self.logger.error("Recovery failed, shutting down")
                             break
-
-                    time.sleep(0.001)
                 except KeyboardInterrupt:
                     self.logger.info("Keyboard interrupt received, shutting down")
                     break
@@ -285,108 +324,109 @@ class MainController:
         finally:
             self._graceful_shutdown()
 
+    @contextmanager
+    def _frame_timing(self):
+        """Time a frame and record it with the performance monitor on every exit path."""
+        timing = {'detection': 0, 'display': 0, 'skipped': False}  # durations in monotonic ns
+        frame_start_ns = time.monotonic_ns()
+        try:
+            yield timing
+        finally:
+            if self.performance_monitor:
+                self.performance_monitor.record_frame_end(frame_start_ns, timing['detection'], timing['display'],
+                                                          skipped=timing['skipped'])
+
     def process_frame(self) -> bool:
         if self.performance_monitor and self.performance_monitor.should_skip_frame():
-            if self.performance_monitor:
-                self.performance_monitor.record_frame_end(time.time(), skipped=True)
+            with self._frame_timing() as timing:
+                timing['skipped'] = True
             return True
 
-        frame_start_time = time.time()
-        detection_time = 0.0
-        display_time = 0.0
-
-        try:
-            if not self.camera_manager or not self.camera_manager.is_connected():
-                self._handle_error(ErrorType.CAMERA_CONNECTION_FAILED, "Camera not connected")
-                if self.performance_monitor:
-                    self.performance_monitor.record_frame_end(frame_start_time, detection_time, display_time, skipped=False)
-                return False
-
-            frame = self.camera_manager.get_frame()
-            if frame is None:
-                self._handle_error(ErrorType.FRAME_PROCESSING_FAILED, "Failed to get frame from camera")
-                if self.performance_monitor:
-                    self.performance_monitor.record_frame_end(frame_start_time, detection_time, display_time, skipped=False)
-                return False
-
-            detections = []
-            if self.human_detector and self.app_state.detection_enabled:
-                try:
-                    detection_frame = frame
-                    if self.performance_monitor and self.performance_monitor.current_quality_level < 1.0:
-                        try:
-                            q = self.performance_monitor.current_quality_level
-                            if q <= 0:
-                                q = 1.0
-                            h, w = frame.shape[:2]
-                            new_w = max(1, int(w * q))
-                            new_h = max(1, int(h * q))
-                            import cv2
-                            detection_frame = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
-                        except Exception as e:
-                            self.logger.debug(f"Failed to resize frame for detection: {e}")
-
-                    detection_start = time.time()
-                    detections = self.human_detector.detect_humans(detection_frame)
-                    detection_time = time.time() - detection_start
-                except Exception as e:
-                    self._handle_error(ErrorType.FRAME_PROCESSING_FAILED, f"Detection failed: {e}")
-
-            if self.display_manager:
-                try:
-                    display_start = time.time()
-                    if not self.display_manager.display_frame(frame, detections):
-                        self.app_state.is_running = False
-                        if self.performance_monitor:
-                            self.performance_monitor.record_frame_end(frame_start_time, detection_time, display_time, skipped=False)
-                        return True
-                    display_time = time.time() - display_start
-                    self.app_state.fps_counter = self.display_manager.get_fps()
-                except Exception as e:
-                    self._handle_error(ErrorType.DISPLAY_FAILED, f"Display failed: {e}")
-                    if self.performance_monitor:
-                        self.performance_monitor.record_frame_end(frame_start_time, detection_time, display_time, skipped=False)
+        with self._frame_timing() as timing:
+            try:
+                if not self.camera_manager or not self.camera_manager.is_connected():
+                    self._handle_error(ErrorType.CAMERA_CONNECTION_FAILED, "Camera not connected")
                     return False
 
-            # On successful processing, reset backoff for error logging so future errors are reported promptly
-            try:
-                for et in self._error_log_intervals:
-                    self._error_log_intervals[et] = self._error_log_base_interval
-                    self._last_error_log_times[et] = 0.0
-            except Exception:
-                pass
+                frame = self.camera_manager.get_frame()
+                if frame is None:
+                    self._handle_error(ErrorType.FRAME_PROCESSING_FAILED, "Failed to get frame from camera")
+                    return False
 
-            if self.performance_monitor:
-                self.performance_monitor.record_frame_end(frame_start_time, detection_time, display_time, skipped=False)
+                # A quit requested while the frame was being captured (e.g. from the display
+                # thread in main.py) must not cost one more inference pass
+                if not self.app_state.is_running:
+                    return True
 
-            try:
-                if self.performance_monitor:
-                    mem = self.performance_monitor.get_current_memory_usage()
-                    if mem > self.performance_monitor.max_memory_mb * 0.85:
-                        import gc
-                        gc.collect()
-                        now = time.time()
-                        if now - getattr(self, '_last_mem_cleanup_time', 0) > 5.0:
-                            self.logger.info(f"High memory detected ({mem:.1f}MB). Performed explicit garbage collection")
-                            self._last_mem_cleanup_time = now
+                detections = []
+                if self.human_detector and self.app_state.detection_enabled:
+                    try:
+                        detection_frame = frame
+                        scale = 1.0
+                        if self.performance_monitor and self.performance_monitor.current_quality_level < 1.0:
+                            try:
+                                q = self.performance_monitor.current_quality_level
+                                if q <= 0:
+                                    q = 1.0
+                                detection_frame = self._cv2_resize(frame, (0, 0), fx=q, fy=q, interpolation=_INTER_AREA)
+                                scale = q
+                            except Exception as e:
+                                self.logger.debug(f"Failed to resize frame for detection: {e}")
+
+                        detection_start = time.monotonic_ns()
+                        detections = self.human_detector.detect_humans_zero_copy(detection_frame)
+                        if scale != 1.0 and detections:
+                            detections = detections.scaled(frame.shape[1] / detection_frame.shape[1],
+                                                           frame.shape[0] / detection_frame.shape[0])
+                        timing['detection'] = time.monotonic_ns() - detection_start
+                    except Exception as e:
+                        self._handle_error(ErrorType.FRAME_PROCESSING_FAILED, f"Detection failed: {e}")
+
+                if self.frame_sink is not None:
+                    self.frame_sink(frame, detections)
+                elif self.display_manager:
+                    try:
+                        display_start = time.monotonic_ns()
+                        if not self.display_manager.display_frame(frame, detections):
+                            self.app_state.is_running = False
+                            return True
+                        timing['display'] = time.monotonic_ns() - display_start
+                        self.app_state.fps_counter = self.display_manager.get_fps()
+                    except Exception as e:
+                        self._handle_error(ErrorType.DISPLAY_FAILED, f"Display failed: {e}")
+                        return False
+
+                # On successful processing, reset backoff for error logging so future errors are reported promptly
+                try:
+                    for et in self._error_log_intervals:
+                        self._error_log_intervals[et] = self._error_log_base_interval
+                        self._last_error_log_times[et] = 0.0
+                except Exception:
+                    pass
             except Exception as e:
-                self.logger.debug(f"Memory cleanup attempt failed: {e}")
+                self._handle_error(ErrorType.FRAME_PROCESSING_FAILED, f"Frame processing error: {e}")
+                return False
 
-            return True
-        except Exception as e:
-            self._handle_error(ErrorType.FRAME_PROCESSING_FAILED, f"Frame processing error: {e}")
+        try:
             if self.performance_monitor:
-                self.performance_monitor.record_frame_end(frame_start_time, detection_time, display_time, skipped=False)
-            return False
+                mem = self.performance_monitor.get_current_memory_usage()
+                if mem > self.performance_monitor.max_memory_mb * 0.85:
+                    import gc
+                    gc.collect(1)
+                    now = time.time()
+                    if now - getattr(self, '_last_mem_cleanup_time', 0) > 5.0:
+                        self.logger.info(f"High memory detected ({mem:.1f}MB). Performed young-generation garbage collection")
+                        self._last_mem_cleanup_time = now
+        except Exception as e:
+            self.logger.debug(f"Memory cleanup attempt failed: {e}")
+
+        return True
 
     def _handle_error(self, error_type: ErrorType, message: str):
         # Update counters and backoff-aware logging to prevent flooding
-        try:
-            self.error_counts[error_type] += 1
-        except Exception:
-            # Ensure error_counts exists during unusual states
-            self.error_counts = getattr(self, 'error_counts', {et: 0 for et in ErrorType})
-            self.error_counts[error_type] = self.error_counts.get(error_type, 0) + 1
+        self.error_counts[error_type] += 1
+        self._error_counts_view[error_type.value] += 1
+        self._status_dirty = True
 
         self.app_state.error_message = message
         now = time.time()
@@ -430,6 +470,7 @@ class MainController:
         return troubleshooting_messages.get(error_type, "")
 
     def _attempt_recovery(self) -> bool:
+        self._status_dirty = True
         self.recovery_attempts += 1
         if self.recovery_attempts > self.max_recovery_attempts:
             self.logger.error(f"Maximum recovery attempts ({self.max_recovery_attempts}) exceeded")
@@ -437,8 +478,8 @@ class MainController:
 
         self.logger.info(f"Attempting recovery (attempt {self.recovery_attempts}/{self.max_recovery_attempts})")
 
-        camera_errors = (self.error_counts.get(ErrorType.CAMERA_CONNECTION_FAILED, 0) +
-                         self.error_counts.get(ErrorType.FRAME_PROCESSING_FAILED, 0))
+        camera_errors = (self.error_counts[ErrorType.CAMERA_CONNECTION_FAILED] +
+                         self.error_counts[ErrorType.FRAME_PROCESSING_FAILED])
         if camera_errors > 0 and self.camera_manager:
             if self._attempt_camera_recovery():
                 self.logger.info("Camera recovery successful")
@@ -481,7 +522,7 @@ class MainController:
     def _attempt_component_restart(self) -> bool:
         try:
             self.logger.info("Attempting to restart components")
-            if self.error_counts.get(ErrorType.DISPLAY_FAILED, 0) > 0:
+            if self.error_counts[ErrorType.DISPLAY_FAILED] > 0:
                 try:
                     if self.display_manager:
                         self.display_manager.cleanup()
@@ -490,7 +531,7 @@ class MainController:
                 except Exception as e:
                     self.logger.error(f"Failed to restart display manager: {e}")
 
-            if self.error_counts.get(ErrorType.MODEL_LOADING_FAILED, 0) > 0:
+            if self.error_counts[ErrorType.MODEL_LOADING_FAILED] > 0:
                 try:
                     self.human_detector = HumanDetector(confidence_threshold=0.5)
                     if self.human_detector.load_model():
@@ -507,6 +548,7 @@ class MainController:
             return False
 
     def _graceful_shutdown(self):
+        self._status_dirty = True
         self.logger.info("Performing graceful shutdown...")
         try:
             self.app_state.is_running = False
@@ -538,31 +580,42 @@ class MainController:
             self.logger.error(f"Error during graceful shutdown: {e}")
 
     def _log_final_statistics(self):
-        self.logger.info("=== Final System Statistics ===")
-        self.logger.info(f"Total recovery attempts: {self.recovery_attempts}")
-        self.logger.info(f"Final camera source: {self.app_state.current_camera}")
-        self.logger.info(f"Detection enabled: {self.app_state.detection_enabled}")
-        self.logger.info(f"Final FPS: {self.app_state.fps_counter:.1f}")
-        self.logger.info("Error counts by type:")
-        for error_type, count in self.error_counts.items():
-            if count > 0:
-                self.logger.info(f"  {error_type.value}: {count}")
-
-    def get_system_status(self) -> Dict[str, Any]:
-        return {
-            'is_running': self.app_state.is_running,
-            'current_camera': self.app_state.current_camera,
-            'detection_enabled': self.app_state.detection_enabled,
-            'fps': self.app_state.fps_counter,
-            'error_message': self.app_state.error_message,
-            'consecutive_errors': self.consecutive_errors,
-            'recovery_attempts': self.recovery_attempts,
-            'error_counts': {error_type.value: count for error_type, count in self.error_counts.items()},
-            'camera_connected': self.camera_manager.is_connected() if self.camera_manager else False,
-            'model_loaded': self.human_detector.is_model_loaded() if self.human_detector else False,
-        }
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        lines = [
+            "=== Final System Statistics ===",
+            f"Total recovery attempts: {self.recovery_attempts}",
+            f"Final camera source: {self.app_state.current_camera}",
+            f"Detection enabled: {self.app_state.detection_enabled}",
+            f"Final FPS: {self.app_state.fps_counter:.1f}",
+            "Error counts by type:",
+        ]
+        lines.extend(f"  {error_type.value}: {count}" for error_type, count in self.error_counts.items() if count > 0)
+        self.logger.info("\n".join(lines))
+
+    def get_system_status(self) -> Mapping[str, Any]:
+        """Return a read-only snapshot of the system status.
+
+        Scalar fields and the camera connection (an isOpened() check plus a frame-age
+        compare) are refreshed on every call; only the model probe is recomputed after
+        an event marks the cache dirty. 'error_counts' is a live read-only view.
+        """
+        cache = self._status_cache
+        if self._status_dirty:
+            self._status_dirty = False
+            cache['model_loaded'] = self.human_detector.is_model_loaded() if self.human_detector else False
+        cache['camera_connected'] = self.camera_manager.is_connected() if self.camera_manager else False
+        cache['is_running'] = self.app_state.is_running
+        cache['current_camera'] = self.app_state.current_camera
+        cache['detection_enabled'] = self.app_state.detection_enabled
+        cache['fps'] = self.app_state.fps_counter
+        cache['error_message'] = self.app_state.error_message
+        cache['consecutive_errors'] = self.consecutive_errors
+        cache['recovery_attempts'] = self.recovery_attempts
+        return MappingProxyType(dict(cache))
 
     def force_camera_switch(self) -> bool:
+        self._status_dirty = True
         try:
             if not self.camera_manager:
                 return False
@@ -638,6 +691,7 @@ class MainController:
             return False
 
     def _graceful_shutdown(self):
+        self._status_dirty = True
         self.logger.info("Performing graceful shutdown...")
         try:
             self.app_state.is_running = False
@@ -669,31 +723,42 @@ class MainController:
             self.logger.error(f"Error during graceful shutdown: {e}")
 
     def _log_final_statistics(self):
-        self.logger.info("=== Final System Statistics ===")
-        self.logger.info(f"Total recovery attempts: {self.recovery_attempts}")
-        self.logger.info(f"Final camera source: {self.app_state.current_camera}")
-        self.logger.info(f"Detection enabled: {self.app_state.detection_enabled}")
-        self.logger.info(f"Final FPS: {self.app_state.fps_counter:.1f}")
-        self.logger.info("Error counts by type:")
-        for error_type, count in self.error_counts.items():
-            if count > 0:
-                self.logger.info(f"  {error_type.value}: {count}")
-
-    def get_system_status(self) -> Dict[str, Any]:
-        return {
-            'is_running': self.app_state.is_running,
-            'current_camera': self.app_state.current_camera,
-            'detection_enabled': self.app_state.detection_enabled,
-            'fps': self.app_state.fps_counter,
-            'error_message': self.app_state.error_message,
-            'consecutive_errors': self.consecutive_errors,
-            'recovery_attempts': self.recovery_attempts,
-            'error_counts': {error_type.value: count for error_type, count in self.error_counts.items()},
-            'camera_connected': self.camera_manager.is_connected() if self.camera_manager else False,
-            'model_loaded': self.human_detector.is_model_loaded() if self.human_detector else False,
-        }
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        lines = [
+            "=== Final System Statistics ===",
+            f"Total recovery attempts: {self.recovery_attempts}",
+            f"Final camera source: {self.app_state.current_camera}",
+            f"Detection enabled: {self.app_state.detection_enabled}",
+            f"Final FPS: {self.app_state.fps_counter:.1f}",
+            "Error counts by type:",
+        ]
+        lines.extend(f"  {error_type.value}: {count}" for error_type, count in self.error_counts.items() if count > 0)
+        self.logger.info("\n".join(lines))
+
+    def get_system_status(self) -> Mapping[str, Any]:
+        """Return a read-only snapshot of the system status.
+
+        Scalar fields and the camera connection (an isOpened() check plus a frame-age
+        compare) are refreshed on every call; only the model probe is recomputed after
+        an event marks the cache dirty. 'error_counts' is a live read-only view.
+        """
+        cache = self._status_cache
+        if self._status_dirty:
+            self._status_dirty = False
+            cache['model_loaded'] = self.human_detector.is_model_loaded() if self.human_detector else False
+        cache['camera_connected'] = self.camera_manager.is_connected() if self.camera_manager else False
+        cache['is_running'] = self.app_state.is_running
+        cache['current_camera'] = self.app_state.current_camera
+        cache['detection_enabled'] = self.app_state.detection_enabled
+        cache['fps'] = self.app_state.fps_counter
+        cache['error_message'] = self.app_state.error_message
+        cache['consecutive_errors'] = self.consecutive_errors
+        cache['recovery_attempts'] = self.recovery_attempts
+        return MappingProxyType(dict(cache))
 
     def force_camera_switch(self) -> bool:
+        self._status_dirty = True
         try:
             if not self.camera_manager:
                 return False
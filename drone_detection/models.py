@@ -1,12 +1,26 @@
 """Data models for the drone human detection system."""
 
-from dataclasses import dataclass
-from typing import Tuple, Optional
+from dataclasses import dataclass, field
+from typing import Iterator, List, Sequence, Tuple, Optional
 
+import numpy as np
 
-@dataclass
+
+def _frozen_empty(shape, dtype) -> np.ndarray:
+    array = np.empty(shape, dtype=dtype)
+    array.setflags(write=False)
+    return array
+
+
+# Shared read-only columns for DetectionBatch.empty(), which runs on every frame without detections
+_EMPTY_BOXES = _frozen_empty((0, 4), np.int32)
+_EMPTY_SCORES = _frozen_empty(0, np.float32)
+_EMPTY_CLASS_IDS = _frozen_empty(0, np.int32)
+
+
+@dataclass(slots=True, frozen=True)
 class DetectionResult:
-    """Represents a human detection result."""
+    """Represents a human detection result (immutable; use dataclasses.replace to derive)."""
     bbox: Tuple[int, int, int, int]  # x1, y1, x2, y2
     confidence: float
     class_id: int
@@ -15,7 +29,71 @@ class DetectionResult:
     raw_bbox: Tuple[float, float, float, float] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
+class DetectionBatch:
+    """Column-oriented (SoA) set of detections for vectorized downstream processing.
+
+    Indexing or iterating yields DetectionResult views so code written against
+    List[DetectionResult] keeps working.
+    """
+    boxes: np.ndarray  # (N, 4) int32: x1, y1, x2, y2
+    scores: np.ndarray  # (N,) float32
+    class_ids: np.ndarray  # (N,) int32
+    names: List[str] = field(default_factory=list)
+    # Optional (N, 4) float32 raw boxes as returned by the model (possibly normalized)
+    raw_boxes: Optional[np.ndarray] = None
+
+    @classmethod
+    def empty(cls) -> "DetectionBatch":
+        return cls(_EMPTY_BOXES, _EMPTY_SCORES, _EMPTY_CLASS_IDS, [])
+
+    @classmethod
+    def from_results(cls, results: Sequence[DetectionResult]) -> "DetectionBatch":
+        if not results:
+            return cls.empty()
+        raw_boxes = None
+        if all(r.raw_bbox is not None for r in results):
+            raw_boxes = np.array([r.raw_bbox for r in results], dtype=np.float32)
+        return cls(
+            boxes=np.array([r.bbox for r in results], dtype=np.int32).reshape(-1, 4),
+            scores=np.array([r.confidence for r in results], dtype=np.float32),
+            class_ids=np.array([r.class_id for r in results], dtype=np.int32),
+            names=[r.class_name for r in results],
+            raw_boxes=raw_boxes,
+        )
+
+    def scaled(self, sx: float, sy: float) -> "DetectionBatch":
+        """Return a copy with pixel coordinates scaled by (sx, sy); normalized raw boxes are kept."""
+        factors = np.array([sx, sy, sx, sy], dtype=np.float32)
+        boxes = (self.boxes * factors).astype(np.int32)
+        raw_boxes = self.raw_boxes
+        if raw_boxes is not None:
+            pixel_rows = np.abs(raw_boxes).max(axis=1) > 1.0
+            raw_boxes = np.where(pixel_rows[:, None], raw_boxes * factors, raw_boxes).astype(np.float32)
+        return DetectionBatch(boxes, self.scores, self.class_ids, list(self.names), raw_boxes)
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def __getitem__(self, index: int) -> DetectionResult:
+        x1, y1, x2, y2 = self.boxes[index].tolist()
+        raw_bbox = None
+        if self.raw_boxes is not None:
+            raw_bbox = tuple(self.raw_boxes[index].tolist())
+        return DetectionResult(
+            bbox=(x1, y1, x2, y2),
+            confidence=float(self.scores[index]),
+            class_id=int(self.class_ids[index]),
+            class_name=self.names[index],
+            raw_bbox=raw_bbox,
+        )
+
+    def __iter__(self) -> Iterator[DetectionResult]:
+        for i in range(len(self.boxes)):
+            yield self[i]
+
+
+@dataclass(slots=True, frozen=True)
 class CameraConfig:
     """Configuration for camera sources."""
     source_type: str  # 'drone' or 'laptop'
@@ -23,9 +101,10 @@ class CameraConfig:
     resolution: Tuple[int, int]
     fps: int
     connection_timeout: float
+    buffer_size: int = 1  # frames queued by the capture backend; 1 always delivers the newest
 
 
-@dataclass
+@dataclass(slots=True)
 class AppState:
     """Application state management."""
     is_running: bool
@@ -1,14 +1,20 @@
 """Performance monitoring and optimization for the drone human detection system."""
 
+import itertools
 import time
 import psutil
 import threading
 import logging
-from typing import Deque, Optional, List
+from typing import Optional, List
 from dataclasses import dataclass
-from collections import deque
 import gc
 
+import numpy as np
+
+# Width of the rolling slow-frame bitmap kept by PerformanceMonitor
+_SLOW_WINDOW_BITS = 64
+_SLOW_WINDOW_MASK = (1 << _SLOW_WINDOW_BITS) - 1
+
 
 @dataclass
 class PerformanceMetrics:
@@ -23,19 +29,74 @@ class PerformanceMetrics:
     memory_peak_mb: float
 
 
+class RingBuffer:
+    """Fixed-size float64 ring buffer that keeps a running sum for O(1) averages."""
+
+    def __init__(self, size: int):
+        self._data = np.zeros(size, dtype=np.float64)
+        self._size = size
+        self._idx = 0
+        self.count = 0
+        self.total = 0.0
+
+    def append(self, value: float):
+        idx = self._idx
+        self.total += value - self._data[idx].item()
+        self._data[idx] = value
+        idx += 1
+        if idx == self._size:
+            idx = 0
+            # Resynchronise the running sum once per wrap to shed float drift
+            self.total = float(self._data.sum())
+        self._idx = idx
+        if self.count < self._size:
+            self.count += 1
+
+    def mean(self) -> float:
+        if self.count == 0:
+            return 0.0
+        return self.total / self.count
+
+    def last(self) -> float:
+        return float(self._data[self._idx - 1])
+
+    def clear(self):
+        self._data.fill(0.0)
+        self._idx = 0
+        self.count = 0
+        self.total = 0.0
+
+    def __len__(self) -> int:
+        return self.count
+
+
 class PerformanceMonitor:
     """Monitors and optimizes system performance for real-time processing."""
 
+    # Generational GC thresholds (16x the CPython defaults) so per-frame allocations
+    # trigger far fewer young-generation passes
+    GC_THRESHOLDS = (700 * 16, 10 * 16, 10 * 16)
+
     def __init__(self, target_fps: float = 15.0, max_memory_mb: float = 512.0):
-        self.target_fps = target_fps
         self.max_memory_mb = max_memory_mb
-        self.min_frame_time = 1.0 / target_fps
+        # Setting target_fps also refreshes the derived frame-time and FPS thresholds
+        self.target_fps = target_fps
 
-        # Performance tracking
-        self.frame_times: Deque[float] = deque(maxlen=60)
-        self.processing_times: Deque[float] = deque(maxlen=30)
-        self.detection_times: Deque[float] = deque(maxlen=30)
-        self.display_times: Deque[float] = deque(maxlen=30)
+        # Performance tracking (FPS is computed over the most recent 30 frames).
+        # Durations are stored as monotonic nanoseconds and converted to seconds on read.
+        self.frame_times = RingBuffer(30)
+        self.processing_times = RingBuffer(30)
+        self.detection_times = RingBuffer(30)
+        self.display_times = RingBuffer(30)
+
+        # Thread-safety invariants:
+        # - The scalar counters below and _slow_mask are written only by the
+        #   frame thread (record_frame_end); plain int stores are atomic under the GIL, so
+        #   readers may see a slightly stale value but never a torn one.
+        # - Each RingBuffer updates its slot, running sum and index as a group, so appends
+        #   and cross-thread reads of (count, total) pairs hold _buffer_lock. The critical
+        #   sections only touch a few attributes and are held for well under a microsecond.
+        self._buffer_lock = threading.Lock()
 
         # Counters
         self.frames_processed = 0
@@ -43,16 +104,31 @@ class PerformanceMonitor:
         self.total_frames = 0
 
         # Memory tracking
-        self.memory_samples: Deque[float] = deque(maxlen=100)
+        self.memory_samples = RingBuffer(100)
         self.memory_peak = 0.0
         self.last_gc_time = time.time()
         self.gc_interval = 30.0
+        gc.set_threshold(*self.GC_THRESHOLDS)
+
+        # Cached process handle and (timestamp, memory_mb, cpu_percent) sample. The background
+        # monitor refreshes the sample every second; readers only resample it themselves when it
+        # is older than sample_max_age (e.g. monitoring not started).
+        self._process: Optional[psutil.Process] = None
+        try:
+            self._process = psutil.Process()
+            psutil.cpu_percent(interval=None)  # prime the non-blocking CPU counter
+        except Exception:
+            pass
+        self.sample_max_age = 1.5
+        self._process_sample = (0.0, 0.0, 0.0)
 
         # Frame skipping logic
         self.skip_frames = False
-        self.skip_counter = 0
         self.skip_ratio = 2
-        self.consecutive_slow_frames = 0
+        # Repeating skip decisions for the current ratio: skip_ratio - 1 skips, then one processed frame
+        self._skip_iter = self._make_skip_iter(self.skip_ratio)
+        # Slow/fast history of the last 64 processed frames, one bit per frame (bit 0 = newest)
+        self._slow_mask = 0
 
         # Adaptive quality settings
         self.current_quality_level = 1.0
@@ -61,27 +137,49 @@ class PerformanceMonitor:
         # Threading for background monitoring
         self.monitoring_active = False
         self.monitor_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self.monitor_interval = 1.0
 
         # Logger and rate-limiters
         self.logger = logging.getLogger(__name__)
         self.logger.info(f"Performance monitor initialized: target_fps={target_fps}, max_memory={max_memory_mb}MB")
         self._last_memory_warn_time = 0.0
 
+    @property
+    def target_fps(self) -> float:
+        return self._target_fps
+
+    @target_fps.setter
+    def target_fps(self, target_fps: float):
+        self._target_fps = target_fps
+        self.min_frame_time = 1.0 / target_fps
+        self._min_frame_ns = int(1e9 / target_fps)
+        # Frames slower than this (ns) count as slow in the rolling bitmap
+        self._slow_threshold = self._min_frame_ns * 3 // 2
+        # FPS levels used by frame skipping and quality adjustment
+        self._fps_crit = target_fps * 0.6
+        self._fps_low = target_fps * 0.8
+        self._fps_ok = target_fps * 0.95
+
     def start_monitoring(self):
         if not self.monitoring_active:
             self.monitoring_active = True
+            self._stop_event.clear()
             self.monitor_thread = threading.Thread(target=self._background_monitor, daemon=True)
             self.monitor_thread.start()
             self.logger.info("Background performance monitoring started")
 
     def stop_monitoring(self):
         self.monitoring_active = False
+        self._stop_event.set()
         if self.monitor_thread and self.monitor_thread.is_alive():
-            self.monitor_thread.join(timeout=1.0)
+            self.monitor_thread.join(timeout=1.5)
         self.logger.info("Background performance monitoring stopped")
 
     def _background_monitor(self):
-        while self.monitoring_active:
+        # Schedule each wake-up relative to the previous one so the sampling cadence doesn't drift
+        next_wake = time.monotonic() + self.monitor_interval
+        while not self._stop_event.is_set():
             try:
                 self._update_memory_usage()
                 self._check_garbage_collection()
@@ -90,16 +188,21 @@ class PerformanceMonitor:
                     self._adjust_quality_level()
                 except Exception:
                     pass
-                time.sleep(1.0)
             except Exception as e:
                 self.logger.error(f"Error in background monitoring: {e}")
+            self._stop_event.wait(max(0.0, next_wake - time.monotonic()))
+            next_wake += self.monitor_interval
+            # After a long stall, resume from now instead of firing a burst of catch-up cycles
+            now = time.monotonic()
+            if next_wake < now:
+                next_wake = now + self.monitor_interval
 
-    def record_frame_start(self) -> float:
-        return time.time()
+    def record_frame_start(self) -> int:
+        return time.monotonic_ns()
 
-    def record_frame_end(self, start_time: float, detection_time: float = 0.0, display_time: float = 0.0, skipped: bool = False):
-        end_time = time.time()
-        frame_time = end_time - start_time
+    def record_frame_end(self, start_ns: int, detection_ns: int = 0, display_ns: int = 0, skipped: bool = False):
+        """Record a finished frame; all timings are time.monotonic_ns() based nanoseconds."""
+        frame_ns = time.monotonic_ns() - start_ns
 
         self.total_frames += 1
 
@@ -107,62 +210,84 @@ class PerformanceMonitor:
             self.frames_skipped += 1
         else:
             self.frames_processed += 1
-            self.frame_times.append(frame_time)
-            self.processing_times.append(frame_time)
-            if detection_time > 0:
-                self.detection_times.append(detection_time)
-            if display_time > 0:
-                self.display_times.append(display_time)
-            if frame_time > self.min_frame_time * 1.5:
-                self.consecutive_slow_frames += 1
-            else:
-                self.consecutive_slow_frames = 0
+            with self._buffer_lock:
+                self.frame_times.append(frame_ns)
+                self.processing_times.append(frame_ns)
+                if detection_ns > 0:
+                    self.detection_times.append(detection_ns)
+                if display_ns > 0:
+                    self.display_times.append(display_ns)
+            self._slow_mask = ((self._slow_mask << 1) | (frame_ns > self._slow_threshold)) & _SLOW_WINDOW_MASK
+
+    @property
+    def consecutive_slow_frames(self) -> int:
+        """Number of most recent processed frames in a row that were slow (at most 64)."""
+        mask = self._slow_mask
+        return (mask ^ (mask + 1)).bit_length() - 1
+
+    def recent_slow_ratio(self) -> float:
+        """Fraction of the last 64 processed frames that took over 1.5x the target frame time."""
+        return self._slow_mask.bit_count() / _SLOW_WINDOW_BITS
+
+    @staticmethod
+    def _make_skip_iter(skip_ratio: int):
+        return itertools.cycle((True,) * (skip_ratio - 1) + (False,))
+
+    def _set_skip_ratio(self, skip_ratio: int):
+        if skip_ratio != self.skip_ratio:
+            self.skip_ratio = skip_ratio
+            self._skip_iter = self._make_skip_iter(skip_ratio)
 
     def should_skip_frame(self) -> bool:
-        if not self.skip_frames:
-            self.skip_counter = 0
-            return False
-        self.skip_counter += 1
-        return (self.skip_counter % self.skip_ratio) != 0
+        return next(self._skip_iter) if self.skip_frames else False
 
     def _adjust_frame_skipping(self):
         current_fps = self.get_current_fps()
-        if current_fps < self.target_fps * 0.8:
+        if current_fps < self._fps_low:
             if not self.skip_frames:
                 self.skip_frames = True
                 self.logger.info(f"Enabling frame skipping: current_fps={current_fps:.1f}, target={self.target_fps}")
-        elif current_fps > self.target_fps * 0.95:
+        elif current_fps > self._fps_ok:
             if self.skip_frames:
                 self.skip_frames = False
-                self.skip_counter = 0
+                self._skip_iter = self._make_skip_iter(self.skip_ratio)
                 self.logger.info(f"Disabling frame skipping: current_fps={current_fps:.1f}")
 
         if self.skip_frames:
             fps_ratio = current_fps / max(1e-6, self.target_fps)
-            if fps_ratio < 0.5:
-                self.skip_ratio = 3
-            elif fps_ratio < 0.7:
-                self.skip_ratio = 2
-            else:
-                self.skip_ratio = 2
+            self._set_skip_ratio(3 if fps_ratio < 0.5 else 2)
 
     def get_current_fps(self) -> float:
-        if len(self.frame_times) < 2:
-            return 0.0
-        recent_frames = min(30, len(self.frame_times))
+        with self._buffer_lock:
+            recent_frames = self.frame_times.count
+            total_ns = self.frame_times.total
         if recent_frames < 2:
             return 0.0
-        total_time = sum(list(self.frame_times)[-recent_frames:])
-        if total_time > 0:
-            return recent_frames / total_time
+        if total_ns > 0:
+            return recent_frames * 1e9 / total_ns
         return 0.0
 
+    def _read_memory_mb(self) -> float:
+        if self._process is None:
+            self._process = psutil.Process()
+        return self._process.memory_info().rss / (1024 * 1024)
+
+    def _sample_process(self) -> tuple:
+        sample = (time.time(), self._read_memory_mb(), psutil.cpu_percent(interval=None))
+        self._process_sample = sample
+        return sample
+
+    def _get_process_sample(self) -> tuple:
+        sample = self._process_sample
+        if time.time() - sample[0] > self.sample_max_age:
+            sample = self._sample_process()
+        return sample
+
     def _update_memory_usage(self):
         try:
-            process = psutil.Process()
-            memory_info = process.memory_info()
-            memory_mb = memory_info.rss / (1024 * 1024)
-            self.memory_samples.append(memory_mb)
+            memory_mb = self._sample_process()[1]
+            with self._buffer_lock:
+                self.memory_samples.append(memory_mb)
             self.memory_peak = max(self.memory_peak, memory_mb)
             if memory_mb > self.max_memory_mb:
                 now = time.time()
@@ -174,59 +299,71 @@ class PerformanceMonitor:
 
     def _check_garbage_collection(self):
         current_time = time.time()
-        should_gc = (current_time - self.last_gc_time > self.gc_interval)
-        if self.memory_samples:
-            current_memory = self.memory_samples[-1]
-            should_gc = should_gc or (current_memory > self.max_memory_mb * 0.8)
-        if should_gc:
-            self._run_garbage_collection()
+        under_pressure = False
+        if self.memory_samples.count:
+            under_pressure = self.memory_samples.last() > self.max_memory_mb * 0.8
+        if under_pressure:
+            self._run_garbage_collection(generation=1)
+            self.last_gc_time = current_time
+        elif current_time - self.last_gc_time > self.gc_interval:
+            self._run_garbage_collection(generation=0)
             self.last_gc_time = current_time
 
-    def _run_garbage_collection(self):
+    def _run_garbage_collection(self, generation: int = 0):
         try:
-            before_memory = self.get_current_memory_usage()
-            collected = gc.collect()
-            after_memory = self.get_current_memory_usage()
+            before_memory = self._read_memory_mb()
+            collected = gc.collect(generation)
+            after_memory = self._read_memory_mb()
             memory_freed = before_memory - after_memory
-            self.logger.info(f"Garbage collection: freed {memory_freed:.1f}MB, collected {collected} objects")
+            self.logger.info(f"Garbage collection (gen {generation}): freed {memory_freed:.1f}MB, collected {collected} objects")
         except Exception as e:
             self.logger.error(f"Error during garbage collection: {e}")
 
+    def freeze_long_lived(self):
+        """Move everything allocated so far (model weights, tensors) out of GC tracking.
+
+        Call once after the model is loaded so later collections don't re-scan it.
+        """
+        try:
+            gc.collect()
+            gc.freeze()
+            self.logger.info(f"Froze {gc.get_freeze_count()} long-lived objects out of garbage collection")
+        except Exception as e:
+            self.logger.error(f"Error freezing long-lived objects: {e}")
+
     def get_current_memory_usage(self) -> float:
         try:
-            process = psutil.Process()
-            return process.memory_info().rss / (1024 * 1024)
+            return self._get_process_sample()[1]
         except Exception:
             return 0.0
 
     def get_cpu_usage(self) -> float:
         try:
-            return psutil.cpu_percent(interval=0.1)
+            return self._get_process_sample()[2]
         except Exception:
             return 0.0
 
     def get_performance_metrics(self) -> PerformanceMetrics:
+        with self._buffer_lock:
+            processing_ns = self.processing_times.mean()
+            detection_ns = self.detection_times.mean()
+            display_ns = self.display_times.mean()
         return PerformanceMetrics(
             fps=self.get_current_fps(),
             memory_usage_mb=self.get_current_memory_usage(),
             cpu_usage_percent=self.get_cpu_usage(),
-            frame_processing_time_ms=self._get_average_time(self.processing_times) * 1000,
-            detection_time_ms=self._get_average_time(self.detection_times) * 1000,
-            display_time_ms=self._get_average_time(self.display_times) * 1000,
+            frame_processing_time_ms=processing_ns / 1e6,
+            detection_time_ms=detection_ns / 1e6,
+            display_time_ms=display_ns / 1e6,
             frames_processed=self.frames_processed,
             frames_skipped=self.frames_skipped,
             memory_peak_mb=self.memory_peak,
         )
 
-    def _get_average_time(self, time_deque: deque) -> float:
-        if not time_deque:
-            return 0.0
-        return sum(time_deque) / len(time_deque)
-
     def get_optimization_suggestions(self) -> List[str]:
         suggestions: List[str] = []
         metrics = self.get_performance_metrics()
-        if metrics.fps < self.target_fps * 0.8:
+        if metrics.fps < self._fps_low:
             suggestions.append(f"FPS is low ({metrics.fps:.1f}/{self.target_fps}). Consider reducing resolution or detection frequency.")
         if metrics.memory_usage_mb > self.max_memory_mb * 0.8:
             suggestions.append(f"Memory usage is high ({metrics.memory_usage_mb:.1f}MB). Consider reducing frame buffer size.")
@@ -246,11 +383,11 @@ class PerformanceMonitor:
         if current_fps <= 0.0:
             return
         try:
-            if current_fps < self.target_fps * 0.6:
+            if current_fps < self._fps_crit:
                 new_quality = max(0.25, self.current_quality_level * 0.5)
-            elif current_fps < self.target_fps * 0.8:
+            elif current_fps < self._fps_low:
                 new_quality = max(0.5, self.current_quality_level * 0.75)
-            elif current_fps > self.target_fps * 0.95:
+            elif current_fps > self._fps_ok:
                 new_quality = min(1.0, self.current_quality_level + 0.25)
             else:
                 new_quality = self.current_quality_level
@@ -261,31 +398,36 @@ class PerformanceMonitor:
             self.logger.error(f"Error adjusting quality level: {e}")
 
     def reset_metrics(self):
-        self.frame_times.clear()
-        self.processing_times.clear()
-        self.detection_times.clear()
-        self.display_times.clear()
-        self.memory_samples.clear()
+        with self._buffer_lock:
+            self.frame_times.clear()
+            self.processing_times.clear()
+            self.detection_times.clear()
+            self.display_times.clear()
+            self.memory_samples.clear()
         self.frames_processed = 0
         self.frames_skipped = 0
         self.total_frames = 0
         self.memory_peak = 0.0
-        self.consecutive_slow_frames = 0
+        self._slow_mask = 0
         self.logger.info("Performance metrics reset")
 
     def log_performance_summary(self):
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         metrics = self.get_performance_metrics()
-        self.logger.info("=== Performance Summary ===")
-        self.logger.info(f"FPS: {metrics.fps:.1f} (target: {self.target_fps})")
-        self.logger.info(f"Memory: {metrics.memory_usage_mb:.1f}MB (peak: {metrics.memory_peak_mb:.1f}MB)")
-        self.logger.info(f"CPU: {metrics.cpu_usage_percent:.1f}%")
-        self.logger.info(f"Frame processing: {metrics.frame_processing_time_ms:.1f}ms")
-        self.logger.info(f"Detection time: {metrics.detection_time_ms:.1f}ms")
-        self.logger.info(f"Display time: {metrics.display_time_ms:.1f}ms")
-        self.logger.info(f"Frames processed: {metrics.frames_processed}")
-        self.logger.info(f"Frames skipped: {metrics.frames_skipped}")
+        lines = [
+            "=== Performance Summary ===",
+            f"FPS: {metrics.fps:.1f} (target: {self.target_fps})",
+            f"Memory: {metrics.memory_usage_mb:.1f}MB (peak: {metrics.memory_peak_mb:.1f}MB)",
+            f"CPU: {metrics.cpu_usage_percent:.1f}%",
+            f"Frame processing: {metrics.frame_processing_time_ms:.1f}ms",
+            f"Detection time: {metrics.detection_time_ms:.1f}ms",
+            f"Display time: {metrics.display_time_ms:.1f}ms",
+            f"Frames processed: {metrics.frames_processed}",
+            f"Frames skipped: {metrics.frames_skipped}",
+        ]
         suggestions = self.get_optimization_suggestions()
         if suggestions:
-            self.logger.info("Optimization suggestions:")
-            for suggestion in suggestions:
-                self.logger.info(f"  - {suggestion}")
\ No newline at end of file
+            lines.append("Optimization suggestions:")
+            lines.extend(f"  - {suggestion}" for suggestion in suggestions)
+        self.logger.info("\n".join(lines))
@@ -11,18 +11,20 @@ from typing import Optional, List
 
 try:
     import tkinter as tk
-    from PIL import Image, ImageTk
     TK_AVAILABLE = True
 except Exception:
     TK_AVAILABLE = False
 
 import cv2
 import numpy as np
-from .models import DetectionResult
+from .models import DetectionResult, DetectionBatch
 from .display_manager import DisplayManager as BaseDisplayManager
 
 
 class TkDisplayManager(BaseDisplayManager):
+    # Poll interval for posted frames under mainloop(): well under one frame at 60 FPS
+    _DRAIN_INTERVAL_MS = 5
+
     def __init__(self, window_title: str = "Drone Human Detection GUI"):
         super().__init__()
         self.window_title = window_title
@@ -30,13 +32,31 @@ class TkDisplayManager(BaseDisplayManager):
         self._canvas = None
         self._image_on_canvas = None
         self._running = False
-        self._lock = threading.Lock()
-        self._thread: Optional[threading.Thread] = None
         self._last_key = None
+        # Ident of the thread that created the Tk root; only that thread may touch widgets
+        self._tk_thread_id: Optional[int] = None
+        # Lock-free single-producer/single-consumer hand-off of (frame, detections) references.
+        # Only the producer (display_frame) writes _head and the slots; only the consumer
+        # (_render_pending) writes _tail. Each slot store/load is a single reference
+        # operation, atomic under the GIL, so neither side ever blocks. The consumer always
+        # takes the newest slot, which gives drop-oldest semantics.
+        self._slots: list = [None, None]
+        self._head = 0
+        self._tail = 0
         self.logger = logging.getLogger(__name__)
 
+        # Long-lived Tk photo and binary PPM staging buffer (header followed by RGB pixels),
+        # reallocated only when the frame size changes; _rgb_buf is an HxWx3 view of the pixels
+        self._photo = None
+        self._photo_size: Optional[tuple] = None
+        self._ppm_buf: Optional[np.ndarray] = None
+        self._rgb_buf: Optional[np.ndarray] = None
+
+        # Last FPS text pushed to the Tk label (labels use the inherited _label_cache)
+        self._last_fps_text: Optional[str] = None
+
         if not TK_AVAILABLE:
-            self.logger.warning("Tkinter or PIL not available; falling back to headless DisplayManager")
+            self.logger.warning("Tkinter not available; falling back to headless DisplayManager")
 
     def _start_tk(self):
         if not TK_AVAILABLE:
@@ -66,9 +86,40 @@ class TkDisplayManager(BaseDisplayManager):
         self._fps_label = tk.Label(control_frame, text="FPS: 0.0")
         self._fps_label.pack(side=tk.RIGHT)
 
-        # Run the Tk mainloop in a separate thread to avoid blocking
-        self._thread = threading.Thread(target=self._tk_root.mainloop, daemon=True)
-        self._thread.start()
+        # Tk is not thread-safe: the creating thread owns the widgets and renders posted
+        # frames, inline in display_frame or, under mainloop(), via _drain.
+        self._tk_thread_id = threading.get_ident()
+
+    def mainloop(self) -> None:
+        """Run the Tk event loop on the calling thread (must be the thread that owns Tk).
+
+        Use this when frames are produced on a worker thread; display_frame then only
+        posts frames and this loop renders them.
+        """
+        if not TK_AVAILABLE:
+            return
+        if self._tk_root is None:
+            self._start_tk()
+        self._tk_root.after(self._DRAIN_INTERVAL_MS, self._drain)
+        self._tk_root.mainloop()
+
+    def _render_pending(self) -> None:
+        """Render the most recently posted frame, if any (Tk thread only)."""
+        head = self._head
+        if head == self._tail:
+            return
+        frame, detections = self._slots[(head - 1) & 1]
+        self._tail = head
+        self._render(frame, detections)
+
+    def _drain(self) -> None:
+        """Periodic Tk callback (scheduled by mainloop) that renders posted frames."""
+        self._render_pending()
+        try:
+            if self._tk_root:
+                self._tk_root.after(self._DRAIN_INTERVAL_MS, self._drain)
+        except Exception:
+            pass
 
     def _on_quit(self):
         self._running = False
@@ -94,41 +145,103 @@ class TkDisplayManager(BaseDisplayManager):
             self.logger.debug(f"Failed to toggle Tk fullscreen: {e}")
 
     def display_frame(self, frame: np.ndarray, detections: Optional[List[DetectionResult]] = None) -> bool:
-        with self._lock:
-            if not TK_AVAILABLE:
-                # fallback to base implementation
-                return super().display_frame(frame, detections)
+        if not TK_AVAILABLE:
+            # fallback to base implementation
+            return super().display_frame(frame, detections)
+
+        if frame is None:
+            raise ValueError("Frame cannot be None")
 
-            if self._tk_root is None:
-                self._start_tk()
+        if self._tk_root is None:
+            self._start_tk()
 
-            # Draw overlays using base class
-            display_frame = frame.copy()
-            if detections:
-                display_frame = self.draw_detections(display_frame, detections)
-            display_frame = self._draw_fps_counter(display_frame)
+        # Publish a reference to the latest frame; any frame not yet rendered is superseded
+        head = self._head
+        self._slots[head & 1] = (frame, detections)
+        self._head = head + 1
 
-            # Convert BGR->RGB and to PIL Image
+        # Clear last_key before pumping events so keys/buttons handled now reach the main loop
+        self.last_key = None
+
+        # When called from the Tk-owning thread, render now and pump pending events;
+        # otherwise that thread's mainloop() picks the frame up via _drain.
+        if threading.get_ident() == self._tk_thread_id:
             try:
-                img = cv2.cvtColor(display_frame, cv2.COLOR_BGR2RGB)
-                pil = Image.fromarray(img)
-                tkimg = ImageTk.PhotoImage(pil)
-                self._canvas.configure(image=tkimg)
-                self._canvas.image = tkimg
+                self._render_pending()
+                self._tk_root.update()
             except Exception as e:
-                self.logger.error(f"Failed to update Tk canvas: {e}")
-                return super().display_frame(frame, detections)
+                self.logger.error(f"Tk event loop update failed: {e}")
+                return False
+        return True
+
+    def _draw_detections_batched(self, canvas: np.ndarray, detections: List[DetectionResult]) -> None:
+        """Draw all bounding boxes with one polylines call, then one label per detection, in place."""
+        height, width = canvas.shape[:2]
+        if isinstance(detections, DetectionBatch):
+            boxes = detections.boxes.copy()
+            names, scores = detections.names, detections.scores.tolist()
+        else:
+            boxes = np.fromiter((c for d in detections for c in d.bbox), dtype=np.int32,
+                                count=4 * len(detections)).reshape(-1, 4)
+            names, scores = [d.class_name for d in detections], [d.confidence for d in detections]
+        np.clip(boxes[:, 0::2], 0, width - 1, out=boxes[:, 0::2])
+        np.clip(boxes[:, 1::2], 0, height - 1, out=boxes[:, 1::2])
+
+        # (N, 4, 2) corner array: top-left, top-right, bottom-right, bottom-left
+        rects = boxes[:, [0, 1, 2, 1, 2, 3, 0, 3]].reshape(-1, 4, 2)
+        cv2.polylines(canvas, rects, True, self.bbox_color, self.bbox_thickness)
+
+        label_cache = self._label_cache
+        for name, score, (x1, y1, _, _) in zip(names, scores, boxes.tolist()):
+            key = (name, int(score * 100))
+            cached = label_cache.get(key)
+            if cached is None:
+                label = f"{key[0]}: {key[1]}%"
+                cached = (label,) + cv2.getTextSize(label, self.font, self.font_scale, self.text_thickness)
+                label_cache[key] = cached
+            label, (text_width, text_height), baseline = cached
+            bg_y1 = max(0, y1 - text_height - baseline - 5)
+            cv2.rectangle(canvas, (x1, bg_y1), (min(width, x1 + text_width + 10), y1), self.bbox_color, -1)
+            text_y = y1 - 5 if y1 - 5 >= text_height else y1 + text_height + 5
+            cv2.putText(canvas, label, (x1 + 5, text_y), self.font, self.font_scale, self.text_color, self.text_thickness)
+
+    def _render(self, frame: np.ndarray, detections: Optional[List[DetectionResult]]) -> None:
+        # Composite detection overlays into a ping-pong buffer; without detections use the frame as-is
+        if detections:
+            display_frame = self._next_display_buffer(frame)
+            self._draw_detections_batched(display_frame, detections)
+        else:
+            display_frame = frame
+
+        # Convert BGR->RGB into the PPM staging buffer and load it into the persistent photo
+        try:
+            height, width = display_frame.shape[:2]
+            if self._photo is None or self._photo_size != (width, height):
+                header = f"P6\n{width} {height}\n255\n".encode('ascii')
+                self._ppm_buf = np.empty(len(header) + height * width * 3, dtype=np.uint8)
+                self._ppm_buf[:len(header)] = np.frombuffer(header, dtype=np.uint8)
+                self._rgb_buf = self._ppm_buf[len(header):].reshape(height, width, 3)
+                self._photo = tk.PhotoImage(width=width, height=height)
+                self._photo_size = (width, height)
+                self._canvas.configure(image=self._photo)
+                self._canvas.image = self._photo
+            cv2.cvtColor(display_frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+            # FPS overlay colours are channel-symmetric, so it can be drawn on the RGB buffer
+            self._draw_fps_counter(self._rgb_buf)
+            self._photo.configure(data=self._ppm_buf.tobytes(), format='PPM')
+        except Exception as e:
+            self.logger.error(f"Failed to update Tk canvas: {e}")
+            return
 
-            # update fps label
-            try:
-                if hasattr(self, '_fps_label'):
-                    self._fps_label.config(text=f"FPS: {self.get_fps():.1f}")
-            except Exception:
-                pass
-
-            # Clear last_key after reporting it
-            self.last_key = None
-            return True
+        # update fps label only when the displayed value changes, avoiding a Tk relayout
+        try:
+            if hasattr(self, '_fps_label'):
+                fps_text = f"FPS: {self.get_fps():.1f}"
+                if fps_text != self._last_fps_text:
+                    self._fps_label.config(text=fps_text)
+                    self._last_fps_text = fps_text
+        except Exception:
+            pass
 
     def cleanup(self) -> None:
         try:
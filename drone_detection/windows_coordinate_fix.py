@@ -4,9 +4,23 @@ Windows Coordinate Fix for YOLOv8 Bounding Box Issue
 This module provides a fix for the coordinate misalignment issue experienced on Windows
 where YOLOv8 detections appear with correct confidence but wrong box positions.
 """
+import dataclasses
 import logging
+import weakref
 from typing import List, Tuple, Optional
-import platform
+
+import numpy as np
+try:
+    # Optional: JIT-compiles the per-box coordinate kernel
+    from numba import njit  # type: ignore
+except Exception:
+    njit = None
+
+try:
+    from .windows_compat import IS_WINDOWS
+except ImportError:
+    IS_WINDOWS = False
+
 
 class WindowsCoordinateFix:
     """
@@ -15,8 +29,16 @@ class WindowsCoordinateFix:
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.is_windows = platform.system() == 'Windows'
+        self.is_windows = IS_WINDOWS
         self.coordinate_adjustments_enabled = True
+
+        # Reusable output buffers for fix_box_array, grown (doubled) when a frame has more boxes
+        self._allocate_buffers(256)
+
+    def _allocate_buffers(self, capacity: int) -> None:
+        self._out_buf = np.empty((capacity, 4), dtype=np.int64)
+        self._valid_buf = np.empty(capacity, dtype=np.bool_)
+        self._scaled_buf = np.empty(capacity, dtype=np.bool_)
         
     def fix_coordinates(self, boxes: List[Tuple[float, float, float, float]], 
                        frame_width: int, frame_height: int,
@@ -35,111 +57,199 @@ class WindowsCoordinateFix:
         """
         if not boxes:
             return []
-            
-        fixed_boxes = []
-        
-        for i, (x1, y1, x2, y2) in enumerate(boxes):
-            self.logger.debug(f"Original coordinates {i}: ({x1:.2f}, {y1:.2f}, {x2:.2f}, {y2:.2f})")
-            
-            # Determine if coordinates need scaling
-            needs_scaling = self._needs_coordinate_scaling(x1, y1, x2, y2, frame_width, frame_height)
-            
-            if force_scaling is not None:
-                needs_scaling = force_scaling
-                
-            if needs_scaling:
-                x1, y1, x2, y2 = self._scale_normalized_coordinates(
-                    x1, y1, x2, y2, frame_width, frame_height
-                )
-                self.logger.info(f"Scaled coordinates {i}: ({x1}, {y1}, {x2}, {y2})")
-            
-            # Apply Windows-specific coordinate fixes
-            x1, y1, x2, y2 = self._apply_windows_fixes(x1, y1, x2, y2, frame_width, frame_height)
-            
-            # Ensure coordinates are valid integers within bounds
-            x1, y1, x2, y2 = self._clamp_coordinates(x1, y1, x2, y2, frame_width, frame_height)
-            
-            # Validate final coordinates
-            if self._validate_box(x1, y1, x2, y2):
-                fixed_boxes.append((x1, y1, x2, y2))
-                self.logger.debug(f"Final coordinates {i}: ({x1}, {y1}, {x2}, {y2})")
-            else:
-                self.logger.warning(f"Invalid box rejected: ({x1}, {y1}, {x2}, {y2})")
-                
+
+        ints, valid = self.fix_box_array(np.array(boxes, dtype=np.float64).reshape(-1, 4),
+                                         frame_width, frame_height, force_scaling)
+        fixed_boxes = [tuple(box) for box in ints[valid].tolist()]
+        if self.logger.isEnabledFor(logging.DEBUG):
+            for i, box in enumerate(fixed_boxes):
+                self.logger.debug("Final coordinates %d: %s", i, box)
         return fixed_boxes
-    
-    def _needs_coordinate_scaling(self, x1: float, y1: float, x2: float, y2: float,
-                                frame_width: int, frame_height: int) -> bool:
-        """Determine if coordinates are normalized and need scaling."""
-        # Only treat coordinates as normalized when they are in the 0..1 range.
-        # Previous heuristics that treated small pixel values as normalized
-        # were too aggressive and caused valid pixel coordinates to be
-        # scaled incorrectly (leading to mis-positioned boxes).
-        try:
-            max_coord = max(abs(x1), abs(y1), abs(x2), abs(y2))
-        except Exception:
-            return False
-
-        # If all coordinates are within 0..1 assume normalized coordinates
-        return max_coord <= 1.0
-    
-    def _scale_normalized_coordinates(self, x1: float, y1: float, x2: float, y2: float,
-                                    frame_width: int, frame_height: int) -> Tuple[int, int, int, int]:
-        """Scale normalized (0-1) coordinates to pixel coordinates."""
-        x1_scaled = int(x1 * frame_width)
-        y1_scaled = int(y1 * frame_height)
-        x2_scaled = int(x2 * frame_width)
-        y2_scaled = int(y2 * frame_height)
-        
-        return x1_scaled, y1_scaled, x2_scaled, y2_scaled
-    
-    def _apply_windows_fixes(self, x1: float, y1: float, x2: float, y2: float,
-                           frame_width: int, frame_height: int) -> Tuple[int, int, int, int]:
-        """Apply Windows-specific coordinate fixes."""
-        # Convert to ints for further processing
-        x1_i, y1_i, x2_i, y2_i = int(x1), int(y1), int(x2), int(y2)
-
-        # If not on Windows, do nothing special
-        if not self.is_windows:
-            return x1_i, y1_i, x2_i, y2_i
-
-        # Keep behavior minimal on Windows: do not attempt to guess new
-        # positions. Only ensure coordinates are within bounds; aggressive
-        # auto-repositioning was removed because it produced incorrect boxes.
-        return x1_i, y1_i, x2_i, y2_i
-    
-    def _clamp_coordinates(self, x1: int, y1: int, x2: int, y2: int,
-                         frame_width: int, frame_height: int) -> Tuple[int, int, int, int]:
-        """Clamp coordinates to valid frame bounds."""
-        # Ensure all coordinates are within frame bounds
-        x1 = max(0, min(x1, frame_width - 1))
-        y1 = max(0, min(y1, frame_height - 1))
-        x2 = max(0, min(x2, frame_width - 1))  
-        y2 = max(0, min(y2, frame_height - 1))
-        
-        # Ensure x2 > x1 and y2 > y1
+
+    def fix_coordinates_batch(self, boxes: np.ndarray, frame_width: int, frame_height: int,
+                              force_scaling: bool = None) -> np.ndarray:
+        """
+        Array form of fix_coordinates for callers that already hold boxes in numpy.
+
+        Args:
+            boxes: (N, 4) array of (x1, y1, x2, y2) rows
+            frame_width: Frame width in pixels
+            frame_height: Frame height in pixels
+            force_scaling: Force coordinate scaling (overrides auto-detection)
+
+        Returns:
+            (K, 4) int32 array of the valid fixed boxes, in input order
+        """
+        arr = np.array(boxes, dtype=np.float64).reshape(-1, 4)
+        ints, valid = self.fix_box_array(arr, frame_width, frame_height, force_scaling)
+        return ints[valid].astype(np.int32)
+
+    def fix_box_array(self, arr: np.ndarray, frame_width: int, frame_height: int,
+                      force_scaling: Optional[bool] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fix an (N, 4) float64 array of (x1, y1, x2, y2) rows; arr may be modified.
+
+        Returns:
+            Tuple of the (N, 4) int64 fixed boxes and a boolean mask of valid rows. Both are
+            views of buffers reused by the next call, so consume or copy them before then.
+        """
+        if self.logger.isEnabledFor(logging.DEBUG):
+            for i, (x1, y1, x2, y2) in enumerate(arr.tolist()):
+                self.logger.debug("Original coordinates %d: (%.2f, %.2f, %.2f, %.2f)", i, x1, y1, x2, y2)
+
+        n = len(arr)
+        if n > len(self._valid_buf):
+            self._allocate_buffers(max(n, 2 * len(self._valid_buf)))
+        ints, valid, needs_scaling = self._out_buf[:n], self._valid_buf[:n], self._scaled_buf[:n]
+
+        if _fix_coords_kernel is not None:
+            force = -1 if force_scaling is None else int(bool(force_scaling))
+            _fix_coords_kernel(arr, frame_width, frame_height, force, 10, ints, valid, needs_scaling)
+        else:
+            self._fix_boxes_numpy(arr, frame_width, frame_height, force_scaling, ints, valid, needs_scaling)
+
+        if needs_scaling.any() and self.logger.isEnabledFor(logging.INFO):
+            for i in np.flatnonzero(needs_scaling).tolist():
+                self.logger.info("Scaled coordinates %d: %s", i, tuple(arr[i].astype(np.int64).tolist()))
+        if not valid.all():
+            for box in ints[~valid].tolist():
+                self.logger.warning("Invalid box rejected: %s", tuple(box))
+        return ints, valid
+
+    def _fix_boxes_numpy(self, arr: np.ndarray, frame_width: int, frame_height: int,
+                         force_scaling: Optional[bool], ints: np.ndarray, valid: np.ndarray,
+                         needs_scaling: np.ndarray) -> None:
+        """
+        Scale, truncate, clamp and validate an (N, 4) float64 box array with numpy.
+
+        Scaled rows are written back into arr. The int64 boxes, the validity mask
+        and the mask of rows that were scaled are written into ints, valid and
+        needs_scaling.
+        """
+        # Scale rows that look normalized (all coordinates within 0..1), or all/none if forced.
+        # Only the 0..1 range counts as normalized: earlier heuristics that also treated small
+        # pixel values as normalized mis-positioned valid boxes. Windows needs no further
+        # adjustment; aggressive auto-repositioning was removed because it produced wrong boxes.
+        if force_scaling is None:
+            np.all(np.abs(arr) <= 1.0, axis=1, out=needs_scaling)
+        else:
+            needs_scaling.fill(bool(force_scaling))
+        if needs_scaling.any():
+            arr[needs_scaling] *= np.array([frame_width, frame_height, frame_width, frame_height], dtype=np.float64)
+
+        # Truncate toward zero like int(), then clamp to the frame
+        np.copyto(ints, arr, casting='unsafe')
+        self._clamp_boxes(ints, frame_width, frame_height)
+
+        x1, y1, x2, y2 = ints.T
+        np.logical_and((x2 - x1) >= 10, (y2 - y1) >= 10, out=valid)
+
+    def _clamp_boxes(self, boxes: np.ndarray, frame_width: int, frame_height: int) -> None:
+        """Clamp an (N, 4) integer box array to valid frame bounds in place, without branches."""
+        np.clip(boxes[:, 0::2], 0, frame_width - 1, out=boxes[:, 0::2])
+        np.clip(boxes[:, 1::2], 0, frame_height - 1, out=boxes[:, 1::2])
+
+        # Ensure x2 > x1 and y2 > y1 (minimum box size of 10) via masked copies
+        x1, y1, x2, y2 = boxes.T
+        np.copyto(x2, np.minimum(x1 + 10, frame_width - 1), where=x2 <= x1)
+        np.copyto(y2, np.minimum(y1 + 10, frame_height - 1), where=y2 <= y1)
+
+
+def _fix_coords_py(boxes, frame_width, frame_height, force_scaling, min_size, out, valid, scaled):
+    """
+    Single-pass kernel equivalent of WindowsCoordinateFix._fix_boxes_numpy.
+
+    force_scaling is -1 for auto-detection, 0 to never scale and 1 to always
+    scale. Scaled rows are written back into boxes; results go to out, valid
+    and scaled, which must hold at least len(boxes) rows.
+    """
+    n = boxes.shape[0]
+    max_x = frame_width - 1
+    max_y = frame_height - 1
+    for i in range(n):
+        fx1 = boxes[i, 0]
+        fy1 = boxes[i, 1]
+        fx2 = boxes[i, 2]
+        fy2 = boxes[i, 3]
+        if force_scaling < 0:
+            # Short-circuits on the first coordinate outside 0..1, so pixel boxes exit after one test
+            scale = abs(fx1) <= 1.0 and abs(fy1) <= 1.0 and abs(fx2) <= 1.0 and abs(fy2) <= 1.0
+        else:
+            scale = force_scaling == 1
+        if scale:
+            fx1 *= frame_width
+            fy1 *= frame_height
+            fx2 *= frame_width
+            fy2 *= frame_height
+            boxes[i, 0] = fx1
+            boxes[i, 1] = fy1
+            boxes[i, 2] = fx2
+            boxes[i, 3] = fy2
+        scaled[i] = scale
+
+        x1 = min(max(int(fx1), 0), max_x)
+        y1 = min(max(int(fy1), 0), max_y)
+        x2 = min(max(int(fx2), 0), max_x)
+        y2 = min(max(int(fy2), 0), max_y)
         if x2 <= x1:
-            x2 = min(x1 + 10, frame_width - 1)  # Minimum box width
+            x2 = min(x1 + 10, max_x)
         if y2 <= y1:
-            y2 = min(y1 + 10, frame_height - 1)  # Minimum box height
-            
-        return x1, y1, x2, y2
-    
-    def _validate_box(self, x1: int, y1: int, x2: int, y2: int,
-                     min_size: int = 10) -> bool:
-        """Validate that the bounding box is reasonable."""
-        width = x2 - x1
-        height = y2 - y1
-        
-        # Check minimum size
-        if width < min_size or height < min_size:
-            return False
-            
-        # Check coordinates make sense
-        if x1 >= x2 or y1 >= y2:
-            return False
-            
-        return True
+            y2 = min(y1 + 10, max_y)
+
+        out[i, 0] = x1
+        out[i, 1] = y1
+        out[i, 2] = x2
+        out[i, 3] = y2
+        valid[i] = x2 - x1 >= min_size and y2 - y1 >= min_size
+
+
+# Compiled eagerly at import for the one signature fix_box_array uses (and cached on disk),
+# so no frame pays JIT latency as long as the module is imported before detection starts;
+# HumanDetector.load_model does that. Without numba the numpy implementation is used.
+_fix_coords_kernel = None
+if njit is not None:
+    try:
+        _fix_coords_kernel = njit(
+            "void(float64[:, :], int64, int64, int64, int64, int64[:, :], boolean[:], boolean[:])",
+            cache=True, fastmath=True, boundscheck=False,
+        )(_fix_coords_py)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Numba coordinate kernel unavailable, using numpy: {e}")
+
+
+# Shared instance used by per-frame callers; created on first use
+_SINGLETON: Optional[WindowsCoordinateFix] = None
+
+
+def get_coordinate_fix() -> WindowsCoordinateFix:
+    """Return the shared WindowsCoordinateFix instance."""
+    global _SINGLETON
+    if _SINGLETON is None:
+        _SINGLETON = WindowsCoordinateFix()
+    return _SINGLETON
+
+
+# Coordinate attribute schema per detection class: a single bbox tuple or x1/y1/x2/y2 fields
+_BBOX_SCHEMA = ('bbox',)
+_XYXY_SCHEMA = ('x1', 'y1', 'x2', 'y2')
+_schema_cache: "weakref.WeakKeyDictionary[type, Optional[tuple]]" = weakref.WeakKeyDictionary()
+
+
+def _detection_schema(detection) -> Optional[tuple]:
+    """Return the coordinate schema of a detection's class, probing the first instance seen."""
+    cls = type(detection)
+    try:
+        return _schema_cache[cls]
+    except KeyError:
+        pass
+    if hasattr(detection, 'bbox'):
+        schema = _BBOX_SCHEMA
+    elif hasattr(detection, 'x1'):
+        schema = _XYXY_SCHEMA
+    else:
+        schema = None
+    _schema_cache[cls] = schema
+    return schema
 
 
 def apply_coordinate_fix_to_detections(detections, frame_width: int, frame_height: int):
@@ -147,45 +257,71 @@ def apply_coordinate_fix_to_detections(detections, frame_width: int, frame_heigh
     Apply coordinate fixes to a list of detection results.
     
     This is a convenience function that can be used with existing detection results.
+    A list argument is updated and compacted in place (rejected detections are removed)
+    and returned; other sequences produce a new list.
+    Off Windows the detections are returned unchanged: HumanDetector already scales and
+    clamps its boxes, so the remaining work only matters for the Windows issue.
     """
-    if not detections:
+    if not detections or not IS_WINDOWS:
         return detections
         
-    fix = WindowsCoordinateFix()
-    
-    # Extract coordinate boxes from detections
-    boxes = []
+    fix = get_coordinate_fix()
+
+    # Resolve each detection's coordinate attribute once per class, then gather all boxes
+    # into one array; detections without coordinates are dropped
+    kept = []
+    schemas = []
     for detection in detections:
-        if hasattr(detection, 'bbox'):
-            boxes.append(detection.bbox)
-        elif hasattr(detection, 'x1'):
-            boxes.append((detection.x1, detection.y1, detection.x2, detection.y2))
+        schema = _detection_schema(detection)
+        if schema is not None:
+            kept.append(detection)
+            schemas.append(schema)
+    in_place = isinstance(detections, list)
+    if not kept:
+        if in_place:
+            detections.clear()
+            return detections
+        return []
+
+    arr = np.empty((len(kept), 4), dtype=np.float64)
+    for i, (detection, schema) in enumerate(zip(kept, schemas)):
+        if schema is _BBOX_SCHEMA:
+            arr[i] = detection.bbox
         else:
-            continue
-    
-    # Apply coordinate fixes
-    fixed_boxes = fix.fix_coordinates(boxes, frame_width, frame_height)
-    
-    # Update detection objects with fixed coordinates
-    for i, detection in enumerate(detections):
-        if i < len(fixed_boxes):
-            x1, y1, x2, y2 = fixed_boxes[i]
-            
-            if hasattr(detection, 'bbox'):
+            arr[i] = (detection.x1, detection.y1, detection.x2, detection.y2)
+
+    ints, valid = fix.fix_box_array(arr, frame_width, frame_height)
+
+    # Update valid detections with fixed coordinates (frozen dataclasses are replaced).
+    # Writes never overtake reads: kept holds the originals and write <= their positions.
+    result = detections if in_place else []
+    write = 0
+    for i in np.flatnonzero(valid).tolist():
+        detection = kept[i]
+        x1, y1, x2, y2 = ints[i].tolist()
+        if schemas[i] is _BBOX_SCHEMA:
+            if dataclasses.is_dataclass(detection):
+                detection = dataclasses.replace(detection, bbox=(x1, y1, x2, y2))
+            else:
                 detection.bbox = (x1, y1, x2, y2)
-            elif hasattr(detection, 'x1'):
-                detection.x1 = x1
-                detection.y1 = y1
-                detection.x2 = x2
-                detection.y2 = y2
-    
-    return detections[:len(fixed_boxes)]  # Return only valid detections
+        else:
+            detection.x1 = x1
+            detection.y1 = y1
+            detection.x2 = x2
+            detection.y2 = y2
+        if in_place:
+            result[write] = detection
+        else:
+            result.append(detection)
+        write += 1
+
+    if in_place:
+        del result[write:]
+    return result
 
 
 if __name__ == "__main__":
     # Test the coordinate fix
-    import numpy as np
-    
     # Test with normalized coordinates (common Windows issue)
     test_boxes = [
         (0.1, 0.2, 0.5, 0.8),  # Normalized coordinates
@@ -8,22 +8,57 @@ OpenCV display instead of Tkinter threads.
 import cv2
 import logging
 import platform
-from typing import List, Optional
+import time
+import numpy as np
+from typing import Dict, List, Optional, Tuple
 from .models import DetectionResult
 from .display_manager import DisplayManager
 
+try:
+    from .windows_compat import IS_WINDOWS
+except ImportError:
+    IS_WINDOWS = False
+
+# Host platform name for the HUD, resolved once at import
+_PLATFORM = platform.system()
+
 
 class WindowsSafeDisplayManager(DisplayManager):
     """
     Windows-safe display manager that uses OpenCV instead of problematic Tkinter threading.
     """
+
+    # waitKey code -> action returned by show_frame ('q' or ESC quits)
+    _KEY_ACTIONS = {ord('q'): 'quit', 27: 'quit', ord('c'): 'switch_camera', ord('s'): 'screenshot'}
     
     def __init__(self, window_title: str = "Drone Human Detection"):
         super().__init__()
         self.window_title = window_title
-        self.is_windows = platform.system().lower() == 'windows'
+        self.is_windows = IS_WINDOWS
         self.logger = logging.getLogger(__name__)
-        self._window_created = False
+        # Whether show_frame created its window_title window; separate from the inherited
+        # _window_created, which tracks the window_name window made by display_frame
+        self._title_window_created = False
+        # Win32 handle of the display window (Windows only), used to detect minimization
+        self._hwnd: Optional[int] = None
+        self._user32 = None
+
+        # HUD lines -> (boolean mask of the whole text block, ascent of its first line),
+        # rasterized once per distinct combination of lines
+        self._hud_cache: Dict[Tuple[str, ...], Tuple[np.ndarray, int]] = {}
+        self._hud_font = cv2.FONT_HERSHEY_SIMPLEX
+        # Digit glyph atlas for the detection count, built on first use: the count is
+        # composed from these instead of re-rasterizing the HUD block when it changes
+        self._hud_digits: Optional[Dict[str, np.ndarray]] = None
+        self._hud_digit_ascent = 0
+        self._hud_count_x = 0
+        self._platform_text = f'Platform: {_PLATFORM}'
+        # (width, height) -> (resolution line, first HUD baseline), rebuilt only when the frame size changes
+        self._hud_layout_size: Optional[Tuple[int, int]] = None
+        self._hud_layout: Tuple[str, int] = ('', 0)
+
+        # monotonic() time of the last preview written by save_preview_frame
+        self._last_preview_time: Optional[float] = None
         
         if self.is_windows:
             self.logger.info("Using Windows-safe OpenCV display (no Tkinter threading)")
@@ -37,84 +72,167 @@ class WindowsSafeDisplayManager(DisplayManager):
             detections: List of detection results to draw
             
         Returns:
-            Key pressed by user, or None
+            'quit', 'switch_camera' or 'screenshot' for a mapped key press, or None
         """
         if frame is None:
             return None
             
         try:
-            # Draw detections on the frame
-            display_frame = self.draw_detections(frame, detections or [])
+            if self._title_window_created:
+                # HighGUI reports whether the window still exists here, so < 1 means the
+                # user closed it; quit like DisplayManager.display_frame does
+                if cv2.getWindowProperty(self.window_title, cv2.WND_PROP_VISIBLE) < 1:
+                    return 'quit'
+                # While minimized, skip drawing and presenting; only pump events so keys
+                # still work and the window can be restored
+                if self._is_minimized():
+                    return self._KEY_ACTIONS.get(cv2.waitKey(1) & 0xFF)
+
+            # Draw detections into a reused ping-pong buffer rather than a fresh copy of the
+            # frame. This stays a numpy array rather than a cv2.UMat:
+            # OpenCV's drawing functions have no OpenCL kernels and the HUD is blitted with
+            # numpy masks, so a UMat would only add device map/unmap copies per frame.
+            display_frame = self._next_display_buffer(frame)
+            if detections:
+                self._draw_detections_inplace(display_frame, detections)
             
             # Add system info for debugging
             height, width = display_frame.shape[:2]
+            if self._hud_layout_size != (width, height):
+                self._hud_layout_size = (width, height)
+                self._hud_layout = (f'Resolution: {width}x{height}', height - 80)
+            resolution_text, first_baseline = self._hud_layout
             
-            # Add debug info
-            cv2.putText(display_frame, f'Platform: {platform.system()}', 
-                       (10, height - 80), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-            cv2.putText(display_frame, f'Resolution: {width}x{height}', 
-                       (10, height - 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-            cv2.putText(display_frame, f'Detections: {len(detections) if detections else 0}', 
-                       (10, height - 40), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-            cv2.putText(display_frame, 'Press Q or ESC to quit', 
-                       (10, height - 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+            # Add debug info as one cached four-line block (only new combinations are
+            # rasterized), then the detection count from the digit atlas
+            self._draw_hud_block(display_frame,
+                                 (self._platform_text, resolution_text, 'Detections: ', 'Press Q or ESC to quit'),
+                                 first_baseline)
+            self._draw_hud_count(display_frame, len(detections) if detections else 0, first_baseline + 40)
             
             # Create window if not already created
-            if not self._window_created:
-                cv2.namedWindow(self.window_title, cv2.WINDOW_NORMAL)
+            if not self._title_window_created:
+                # An OpenGL window uploads frames as a texture and lets the GPU scale them;
+                # OpenCV builds without OpenGL raise here, so fall back to a normal window
+                try:
+                    cv2.namedWindow(self.window_title, cv2.WINDOW_OPENGL | cv2.WINDOW_KEEPRATIO)
+                except cv2.error:
+                    cv2.namedWindow(self.window_title, cv2.WINDOW_NORMAL)
                 # Request a default window size of 1920x1080 on Windows
                 try:
                     cv2.resizeWindow(self.window_title, 1920, 1080)
                 except Exception:
                     # Fallback to frame size if resize fails
                     cv2.resizeWindow(self.window_title, width, height)
-                self._window_created = True
+                self._title_window_created = True
+                self._find_window_handle()
                 self.logger.info(f"Display window created: {self.window_title}")
             
             # Show frame
             cv2.imshow(self.window_title, display_frame)
             
-            # Check for key press (Windows-safe)
-            key = cv2.waitKey(1) & 0xFF
-            if key != 255:  # A key was pressed
-                if key == ord('q') or key == 27:  # 'q' or ESC
-                    return 'quit'
-                elif key == ord('c'):
-                    return 'switch_camera'
-                elif key == ord('s'):
-                    return 'screenshot'
-                else:
-                    return chr(key) if 32 <= key <= 126 else None
-                    
+            # Check for key press (Windows-safe); unmapped keys and no key give None
+            return self._KEY_ACTIONS.get(cv2.waitKey(1) & 0xFF)
+
         except Exception as e:
             self.logger.error(f"Error displaying frame: {e}")
             # Fallback to headless mode
-            self.save_preview_frame(frame, "/tmp/preview.jpg" if not self.is_windows else "preview.jpg")
-            self.logger.info("Headless mode: saved preview frame")
+            self.save_preview_frame(frame)
         
         return None
     
+    def _find_window_handle(self) -> None:
+        """Look up the Win32 handle of the display window for _is_minimized."""
+        self._hwnd = None
+        if not self.is_windows:
+            return
+        try:
+            import ctypes
+            self._user32 = ctypes.windll.user32
+            self._hwnd = self._user32.FindWindowW(None, self.window_title) or None
+        except Exception as e:
+            self.logger.debug(f"Could not find display window handle: {e}")
+
+    def _is_minimized(self) -> bool:
+        """Whether the display window is minimized (Win32 IsIconic; always False elsewhere)."""
+        if self._hwnd is None:
+            return False
+        try:
+            return bool(self._user32.IsIconic(self._hwnd))
+        except Exception:
+            return False
+
+    def _draw_hud_block(self, frame, lines: Tuple[str, ...], first_baseline_y: int,
+                        x: int = 10, line_step: int = 20) -> None:
+        """Draw white HUD lines line_step pixels apart in one blit of a cached block mask."""
+        cached = self._hud_cache.get(lines)
+        if cached is None:
+            # Detection counts and resolutions add entries; keep the cache small
+            if len(self._hud_cache) >= 64:
+                self._hud_cache.clear()
+            sizes = [cv2.getTextSize(line, self._hud_font, 0.5, 1) for line in lines]
+            ascent = max(text_height for (_, text_height), _ in sizes)
+            descent = max(baseline for _, baseline in sizes)
+            block_width = max(text_width for (text_width, _), _ in sizes)
+            tile = np.zeros((ascent + line_step * (len(lines) - 1) + descent + 1, block_width + 1), dtype=np.uint8)
+            for i, line in enumerate(lines):
+                cv2.putText(tile, line, (0, ascent + line_step * i), self._hud_font, 0.5, 255, 1)
+            cached = self._hud_cache[lines] = (tile.astype(bool), ascent)
+        mask, ascent = cached
+        self._blit_mask(frame, mask, x, first_baseline_y - ascent, (255, 255, 255))
+
+    def _draw_hud_count(self, frame, count: int, baseline_y: int) -> None:
+        """Draw count after the 'Detections: ' HUD label by stacking cached digit glyphs."""
+        if self._hud_digits is None:
+            (_, ascent), baseline = cv2.getTextSize('0123456789', self._hud_font, 0.5, 1)
+            digits = {}
+            for ch in '0123456789':
+                (advance, _), _ = cv2.getTextSize(ch, self._hud_font, 0.5, 1)
+                tile = np.zeros((ascent + baseline, advance), dtype=np.uint8)
+                cv2.putText(tile, ch, (0, ascent), self._hud_font, 0.5, 255, 1)
+                digits[ch] = tile.astype(bool)
+            self._hud_digits = digits
+            self._hud_digit_ascent = ascent
+            # Pen position after the label: measured with a digit appended, since the
+            # label's own text size is not its advance
+            (labelled_width, _), _ = cv2.getTextSize('Detections: 0', self._hud_font, 0.5, 1)
+            self._hud_count_x = 10 + labelled_width - digits['0'].shape[1]
+        digits = self._hud_digits
+        mask = np.hstack([digits[ch] for ch in str(count)])
+        self._blit_mask(frame, mask, self._hud_count_x, baseline_y - self._hud_digit_ascent, (255, 255, 255))
+
     def cleanup(self):
         """Clean up display resources."""
         try:
-            if self._window_created:
+            if self._title_window_created:
                 cv2.destroyWindow(self.window_title)
-                cv2.destroyAllWindows()
-                self.logger.info("Display windows closed")
+                self._title_window_created = False
+                self._hwnd = None
+                self.logger.info("Display window closed")
         except Exception as e:
             self.logger.error(f"Error during display cleanup: {e}")
+        # The window opened by the inherited display_frame (window_name)
+        super().cleanup()
             
     def is_display_available(self) -> bool:
         """Check if display is available."""
         return True  # OpenCV display should always work
     
     def save_preview_frame(self, frame, filename: str = None):
-        """Save a preview frame to disk."""
+        """Save a preview frame to disk, at most once per second.
+
+        The default is a binary PPM, which is written without any encoding step.
+        """
+        now = time.monotonic()
+        if self._last_preview_time is not None and now - self._last_preview_time < 1.0:
+            return
+        self._last_preview_time = now
+
         if filename is None:
-            filename = "preview.jpg" if self.is_windows else "/tmp/preview.jpg"
+            filename = "preview.ppm" if self.is_windows else "/tmp/preview.ppm"
             
         try:
-            cv2.imwrite(filename, frame)
+            cv2.imwrite(filename, frame, [cv2.IMWRITE_PXM_BINARY, 1])
             self.logger.info(f"Preview frame saved: {filename}")
         except Exception as e:
             self.logger.error(f"Failed to save preview frame: {e}")
@@ -124,7 +242,7 @@ def create_windows_safe_display_manager():
     """
     Factory function to create the appropriate display manager for Windows.
     """
-    if platform.system().lower() == 'windows':
+    if IS_WINDOWS:
         return WindowsSafeDisplayManager()
     else:
         # On non-Windows systems, use the regular display manager
@@ -9,17 +9,25 @@ for both drone receiver feeds and laptop camera fallback.
 import argparse
 import sys
 import logging
-import time
 import platform
+import threading
 
 from drone_detection.models import CameraConfig, AppState
 from drone_detection.main_controller import MainController
 
 # Import Windows compatibility utilities
 try:
-    from drone_detection.windows_compat import ensure_windows_compatibility
+    from drone_detection.windows_compat import IS_WINDOWS, ensure_windows_compatibility, get_windows_compat
 except ImportError:
+    IS_WINDOWS = False
     ensure_windows_compatibility = None
+    get_windows_compat = None
+
+
+def elevate_detection_thread() -> None:
+    """On Windows, raise the calling thread (the one running inference) above normal priority."""
+    if get_windows_compat and IS_WINDOWS:
+        get_windows_compat().elevate_current_thread()
 
 
 def parse_arguments():
@@ -65,6 +73,75 @@ def parse_arguments():
     return parser.parse_args()
 
 
+def run_pipelined(controller, display_manager, logger):
+    """Run capture and detection on a worker thread and display on this thread.
+
+    The worker posts each (frame, detections) pair into a single-slot mailbox that
+    the display side empties; a frame not yet shown when the next one arrives is
+    dropped, so detection never waits on display. HighGUI and Tk calls, and
+    therefore display_frame, stay on the calling (main) thread.
+    """
+    mailbox = [None]
+    lock = threading.Lock()
+    posted = threading.Event()
+    # Camera switching runs on the worker so the camera is only touched by one thread
+    switch_requested = threading.Event()
+
+    def post(frame, detections):
+        with lock:
+            mailbox[0] = (frame, detections)
+            posted.set()
+
+    def detect_loop():
+        # This worker, not the display thread, runs capture handling and inference
+        elevate_detection_thread()
+        while controller.app_state.is_running:
+            if switch_requested.is_set():
+                switch_requested.clear()
+                controller.force_camera_switch()
+            if not controller.process_frame():
+                # Back off briefly instead of spinning while the camera is unavailable;
+                # a camera switch request ends the wait early
+                switch_requested.wait(0.01)
+
+    controller.frame_sink = post
+    # Keep capturing while the worker runs inference, so it always detects on the newest frame
+    if controller.camera_manager:
+        controller.camera_manager.set_async_capture(True)
+    worker = threading.Thread(target=detect_loop, name='detector', daemon=True)
+    worker.start()
+    try:
+        while controller.app_state.is_running:
+            if not posted.wait(0.1):
+                if not worker.is_alive():
+                    break
+                continue
+            with lock:
+                frame, detections = mailbox[0]
+                mailbox[0] = None
+                posted.clear()
+
+            try:
+                if not display_manager.display_frame(frame, detections):
+                    controller.app_state.is_running = False
+                    break
+                controller.app_state.fps_counter = display_manager.get_fps()
+            except Exception as e:
+                logger.error(f"Display failed: {e}")
+                continue
+
+            # Keyboard controls: the key comes from the waitKey(1) display_frame just ran
+            key = display_manager.last_key
+            if key == ord('c'):
+                switch_requested.set()
+            elif key == ord('q') or key == 27:
+                controller.app_state.is_running = False
+    finally:
+        controller.app_state.is_running = False
+        worker.join(timeout=5.0)
+        controller.frame_sink = None
+
+
 def main():
     """Main application entry point."""
     args = parse_arguments()
@@ -77,7 +154,7 @@ def main():
     logger.info(f"Running on {platform.system()} {platform.release()}")
     
     # Initialize Windows compatibility if needed
-    if ensure_windows_compatibility and platform.system().lower() == 'windows':
+    if ensure_windows_compatibility and IS_WINDOWS:
         logger.info("Setting up Windows 11 compatibility...")
         if not ensure_windows_compatibility():
             logger.warning("Windows compatibility setup failed, but continuing...")
@@ -133,20 +210,14 @@ def main():
 
     try:
         controller.app_state.is_running = True
-
-        while controller.app_state.is_running:
-            controller.process_frame()
-
-            # Keyboard controls: read last key from display manager
-            if controller.display_manager:
-                key = getattr(controller.display_manager, 'last_key', None)
-                if key == ord('c'):
-                    controller.force_camera_switch()
-                if key == ord('q') or key == 27:
-                    controller.app_state.is_running = False
-
-            # small sleep to avoid tight loop
-            time.sleep(0.001)
+        display_manager = controller.display_manager
+
+        if display_manager is None:
+            elevate_detection_thread()
+            while controller.app_state.is_running:
+                controller.process_frame()
+        else:
+            run_pipelined(controller, display_manager, logger)
 
     except KeyboardInterrupt:
         logger.info('Keyboard interrupt received')
@@ -1,6 +1,12 @@
+import sys
+import numpy as np
 from drone_detection.windows_coordinate_fix import WindowsCoordinateFix
 fix = WindowsCoordinateFix()
-print('is_windows:', fix.is_windows)
-boxes = [(50,20,150,120), (0.1,0.1,0.3,0.4), (10,10,60,40)]
-print('Original:', boxes)
-print('Fixed:', fix.fix_coordinates(boxes, 640, 480))
+boxes = np.array([(50,20,150,120), (0.1,0.1,0.3,0.4), (10,10,60,40)], dtype=np.float32)
+lines = [
+    f'is_windows: {fix.is_windows}',
+    f'Original: {boxes.tolist()}',
+    f'Fixed: {fix.fix_coordinates_batch(boxes, 640, 480).tolist()}',
+]
+sys.stdout.write('\n'.join(lines) + '\n')
+sys.stdout.flush()